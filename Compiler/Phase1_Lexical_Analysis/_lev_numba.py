@@ -0,0 +1,47 @@
+"""
+Numba-compiled edit distance kernel for identifier suggestions
+
+Only used by error_handler when RapidFuzz is not installed. Importing this
+module raises ImportError when NumPy or Numba is missing.
+"""
+import numpy as np
+from numba import njit
+
+
+def encode(name: str) -> np.ndarray:
+    """Convert a name to an array of code points (nopython mode has no str)"""
+    return np.frombuffer(name.encode('utf-32-le'), dtype=np.uint32)
+
+
+@njit(cache=True)
+def edit_distance(a, b, max_edits):
+    """Damerau-Levenshtein (optimal string alignment) distance of a and b
+    
+    Returns max_edits + 1 when the distance exceeds max_edits, stopping as
+    soon as that is certain - the smallest value in a DP row never decreases.
+    """
+    n = a.shape[0]
+    m = b.shape[0]
+    if abs(n - m) > max_edits:
+        return max_edits + 1
+    
+    before = np.zeros(m + 1, np.int32)   # Row i - 2, for transpositions
+    previous = np.arange(m + 1).astype(np.int32)
+    current = np.zeros(m + 1, np.int32)
+    
+    for i in range(1, n + 1):
+        current[0] = i
+        row_min = i
+        for j in range(1, m + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_edits:
+            return max_edits + 1
+        before, previous, current = previous, current, before
+    
+    return previous[m] if previous[m] <= max_edits else max_edits + 1
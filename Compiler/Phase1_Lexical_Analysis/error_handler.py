@@ -1,93 +1,367 @@
 """
 Enhanced Error Handler with Multiple Error Collection and Smart Suggestions
 """
-from typing import List, Tuple, Optional
+import re
+import sys
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple, Optional
 from difflib import get_close_matches
 
+# RapidFuzz is optional - fall back to difflib when it isn't installed
+try:
+    from rapidfuzz import process as fuzz_process, fuzz
+except ImportError:
+    fuzz_process = None
+    fuzz = None
 
+# Without RapidFuzz, a Numba-compiled edit distance kernel is the next best.
+# Importing Numba is slow, so the kernel is only loaded on the first
+# suggestion lookup; False records a failed import.
+_lev_kernel = None
+
+
+def _edit_distance_kernel():
+    """Return the _lev_numba module, or None when NumPy or Numba is missing"""
+    global _lev_kernel
+    if _lev_kernel is None:
+        try:
+            import _lev_numba as module
+        except ImportError:
+            module = False
+        _lev_kernel = module
+    return _lev_kernel or None
+
+
+# Language keywords, shared by every ErrorHandler for suggestion matching
+KNOWN_KEYWORDS = frozenset({
+    'int', 'long', 'float', 'string', 'boolean', 'array', 'matrix',
+    'if', 'else', 'while', 'for', 'repeat', 'times', 'function',
+    'return', 'end', 'print', 'input', 'break', 'continue',
+    'true', 'false', 'and', 'or', 'not'
+})
+
+# Emoji markers only when writing to a UTF-8 terminal; plain ASCII for
+# pipes, files and CI logs so reports never need re-encoding
+_USE_UNICODE = bool(
+    sys.stdout is not None and sys.stdout.isatty()
+    and 'utf' in (getattr(sys.stdout, 'encoding', None) or '').lower()
+)
+_MARK_OK = "✅" if _USE_UNICODE else "[OK]"
+_MARK_ERR = "❌" if _USE_UNICODE else "[X]"
+_MARK_WARN = "⚠️ " if _USE_UNICODE else "[!]"
+_MARK_HINT = "💡" if _USE_UNICODE else "->"
+_BULLET = "•" if _USE_UNICODE else "*"
+
+# Report layout, built once instead of on every error
+_SEP = '=' * 70
+_ERROR_TEMPLATE = "\n" + _SEP + "\n[{phase} ERROR] Line {line}, Column {column}\n" + _SEP + "\n{message}\n\n"
+_SUMMARY_ERRORS_HEADER = _SEP + "\n  " + _MARK_ERR + " COMPILATION FAILED - {count} ERROR(S) FOUND\n" + _SEP + "\n"
+_SUMMARY_WARNINGS_HEADER = "\n" + _SEP + "\n  " + _MARK_WARN + " WARNINGS ({count})\n" + _SEP + "\n"
+
+# Number of distinct misspelled names whose suggestions are remembered
+SUGGESTION_CACHE_SIZE = 1024
+
+
+@dataclass(slots=True, eq=False)
 class CompilerError:
-    """Base class for all compiler errors"""
+    """Base class for all compiler errors
     
-    def __init__(self, message: str, line: int, column: int, 
-                 source_line: str = "", phase: str = "Unknown"):
-        self.message = message
-        self.line = line
-        self.column = column
-        self.source_line = source_line
-        self.phase = phase
-        self.suggestions = []
+    Only the raw fields are stored; the report text is built by __str__.
+    """
+    message: str
+    line: int
+    column: int
+    source_line: str = ""
+    phase: str = "Unknown"
+    suggestions: Optional[List[str]] = None  # Created on the first add_suggestion
+    wrong_name: Optional[str] = None  # Misspelled identifier to suggest for
     
     def add_suggestion(self, suggestion: str):
         """Add a 'Did you mean...?' suggestion"""
+        if self.suggestions is None:
+            self.suggestions = []
         self.suggestions.append(suggestion)
     
     def __str__(self):
-        error_str = f"\n{'='*70}\n"
-        error_str += f"[{self.phase} ERROR] Line {self.line}, Column {self.column}\n"
-        error_str += f"{'='*70}\n"
-        error_str += f"{self.message}\n\n"
+        parts = [_ERROR_TEMPLATE.format(phase=self.phase, line=self.line,
+                                        column=self.column, message=self.message)]
         
         # Show source code context
         if self.source_line:
-            error_str += "Context:\n"
-            error_str += f"  {self.line:4d} | {self.source_line}\n"
-            error_str += f"       | {' ' * (self.column - 1)}^\n"
+            parts.append("Context:\n")
+            parts.append(f"  {self.line:4d} | {self.source_line}\n")
+            parts.append(f"       | {' ' * (self.column - 1)}^\n")
         
         # Show suggestions
         if self.suggestions:
-            error_str += f"\n💡 Did you mean?\n"
+            parts.append(f"\n{_MARK_HINT} Did you mean?\n")
             for sug in self.suggestions:
-                error_str += f"   • {sug}\n"
+                parts.append(f"   {_BULLET} {sug}\n")
         
-        return error_str
+        return "".join(parts)
+
+
+class SuggestionTrie:
+    """Dict-backed prefix tree of names, searchable by edit distance
+    
+    Each node is a dict mapping a character to its child node; the empty
+    string key marks the end of a stored word and holds the word itself.
+    """
+    
+    def __init__(self, words=()):
+        self.root: Dict[str, dict] = {}
+        for word in words:
+            self.insert(word)
+    
+    def insert(self, word: str):
+        """Add a word to the trie"""
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = word
+    
+    def __contains__(self, word: str) -> bool:
+        node = self.root
+        for char in word:
+            node = node.get(char)
+            if node is None:
+                return False
+        return '' in node
+    
+    def within(self, word: str, max_edits: int) -> List[Tuple[str, int]]:
+        """Find stored words within max_edits Levenshtein edits of word
+        
+        Walks the trie computing one DP row per node, so words sharing a
+        prefix share that work; a branch is dropped once every entry in its
+        row exceeds max_edits.
+        """
+        results = []
+        first_row = list(range(len(word) + 1))
+        stack = [(child, char, first_row) for char, child in self.root.items() if char]
+        
+        while stack:
+            node, char, prev_row = stack.pop()
+            row = [prev_row[0] + 1]
+            for j, word_char in enumerate(word, 1):
+                row.append(min(row[j - 1] + 1,
+                               prev_row[j] + 1,
+                               prev_row[j - 1] + (word_char != char)))
+            
+            if '' in node and row[-1] <= max_edits:
+                results.append((node[''], row[-1]))
+            if min(row) <= max_edits:
+                stack.extend((child, next_char, row) for next_char, child in node.items() if next_char)
+        
+        return results
 
 
 class ErrorHandler:
     """Collects and manages multiple compilation errors"""
     
     def __init__(self, source_code: str = ""):
-        self.errors: List[CompilerError] = []
+        self._errors: List[CompilerError] = []  # Read through the errors property
+        self._error_keys: Set[Tuple[str, int, int, str]] = set()  # Reported (message, line, column, phase)
         self.warnings: List[str] = []
-        self.source_lines = source_code.split('\n') if source_code else []
+        self.source_code = source_code
+        self._line_offsets: Optional[array] = None  # Line start offsets, built on first lookup
         self.known_identifiers = set()
-        self.known_keywords = {
-            'int', 'long', 'float', 'string', 'boolean', 'array', 'matrix',
-            'if', 'else', 'while', 'for', 'repeat', 'times', 'function',
-            'return', 'end', 'print', 'input', 'break', 'continue',
-            'true', 'false', 'and', 'or', 'not'
-        }
+        self._identifier_order: List[str] = []  # known_identifiers in registration order
+        self.known_keywords = KNOWN_KEYWORDS
+        # Merged identifiers + keywords, rebuilt only after add_identifier
+        self._candidates: Tuple[str, ...] = ()
+        self._by_len: Dict[int, List[str]] = {}
+        self._encoded: Dict[str, object] = {}  # Code point arrays for the Numba kernel
+        self._candidates_dirty = True
+        self._trie = SuggestionTrie(KNOWN_KEYWORDS)
+        # LRU cache of suggestions per misspelled name (default pool only)
+        self._suggestion_cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        # Errors awaiting suggestions, each with the identifier count when reported
+        self._pending_suggestions: List[Tuple[CompilerError, int]] = []
+    
+    @property
+    def errors(self) -> List[CompilerError]:
+        """Collected errors, with their suggestions attached"""
+        self.finalize_suggestions()
+        return self._errors
     
     def add_identifier(self, name: str):
         """Register a known identifier for suggestion matching"""
-        self.known_identifiers.add(name)
+        if name not in self.known_identifiers:
+            self.known_identifiers.add(name)
+            self._identifier_order.append(name)
+            self._trie.insert(name)
+            self._candidates_dirty = True
+            self._suggestion_cache.clear()  # Pool changed, old results are stale
+    
+    def _get_candidates(self) -> Tuple[str, ...]:
+        """Get the cached pool of identifiers and keywords to match against"""
+        if self._candidates_dirty:
+            # Sorted, so candidate order (and RapidFuzz's tie order) doesn't
+            # depend on the string hash seed
+            self._candidates = tuple(sorted(self.known_identifiers | self.known_keywords))
+            self._by_len = {}
+            for candidate in self._candidates:
+                self._by_len.setdefault(len(candidate), []).append(candidate)
+            kernel = _edit_distance_kernel() if fuzz_process is None else None
+            if kernel is not None:
+                for candidate in self._candidates:
+                    if candidate not in self._encoded:
+                        self._encoded[candidate] = kernel.encode(candidate)
+            self._candidates_dirty = False
+        return self._candidates
+    
+    def _get_nearby_candidates(self, wrong_name: str) -> List[str]:
+        """Get candidates whose length and edit distance still allow a match
+        
+        A ratio of 2*M / (len(a) + len(b)) can only reach 0.6 when the shorter
+        string is at least 3/7 as long as the longer one, and when the two are
+        at most 0.4 * (len(a) + len(b)) Levenshtein edits apart.
+        """
+        length = len(wrong_name)
+        min_len = (3 * length + 6) // 7
+        max_len = (7 * length) // 3
+        
+        if fuzz_process is not None:
+            # RapidFuzz scores fast enough that the length window is all we need
+            self._get_candidates()
+            window = []
+            for size in range(min_len, max_len + 1):
+                window.extend(self._by_len.get(size, ()))
+            return window
+        
+        kernel = _edit_distance_kernel()
+        if kernel is not None:
+            # Compiled kernel over the length window; OSA distance never
+            # exceeds Levenshtein distance, so the same budget drops nothing
+            self._get_candidates()
+            edit_distance = kernel.edit_distance
+            query = kernel.encode(wrong_name)
+            nearby = []
+            for size in range(min_len, max_len + 1):
+                max_edits = (2 * (length + size)) // 5
+                for candidate in self._by_len.get(size, ()):
+                    if edit_distance(query, self._encoded[candidate], max_edits) <= max_edits:
+                        nearby.append(candidate)
+            return nearby
+        
+        max_edits = (2 * (length + max_len)) // 5
+        return [candidate for candidate, edits in self._trie.within(wrong_name, max_edits)
+                if min_len <= len(candidate) <= max_len
+                and edits <= (2 * (length + len(candidate))) // 5]
     
     def get_source_line(self, line: int) -> str:
         """Get source line at given line number (1-indexed)"""
-        if 0 < line <= len(self.source_lines):
-            return self.source_lines[line - 1]
+        if not self.source_code:
+            return ""
+        
+        # Index line start offsets once instead of keeping a copy of every line
+        if self._line_offsets is None:
+            self._line_offsets = array('I', [0])
+            self._line_offsets.extend(match.end() for match in re.finditer('\n', self.source_code))
+        
+        offsets = self._line_offsets
+        if 0 < line <= len(offsets):
+            start = offsets[line - 1]
+            end = offsets[line] - 1 if line < len(offsets) else len(self.source_code)
+            return self.source_code[start:end]
         return ""
     
     def find_suggestions(self, wrong_name: str, search_in: set = None) -> List[str]:
         """Find similar identifiers using fuzzy matching"""
-        if search_in is None:
-            search_in = self.known_identifiers | self.known_keywords
+        if search_in is not None:
+            return self._match_candidates(wrong_name, search_in)
         
-        matches = get_close_matches(wrong_name, search_in, n=3, cutoff=0.6)
+        # Same typo is often reported many times - reuse earlier results
+        cached = self._suggestion_cache.get(wrong_name)
+        if cached is not None:
+            self._suggestion_cache.move_to_end(wrong_name)
+            return list(cached)
+        
+        matches = self._match_candidates(wrong_name, self._get_nearby_candidates(wrong_name))
+        self._remember_suggestions(wrong_name, matches)
         return matches
     
+    def _remember_suggestions(self, wrong_name: str, matches: List[str]):
+        """Store suggestions in the LRU cache, evicting the oldest entry"""
+        self._suggestion_cache[wrong_name] = tuple(matches)
+        if len(self._suggestion_cache) > SUGGESTION_CACHE_SIZE:
+            self._suggestion_cache.popitem(last=False)
+    
+    def _match_candidates(self, wrong_name: str, candidates) -> List[str]:
+        """Score candidates and return the best (up to 3) above the cutoff"""
+        if fuzz_process is not None:
+            # Same cutoff as difflib (0.6), on RapidFuzz's 0-100 scale
+            matches = fuzz_process.extract(wrong_name, tuple(candidates), scorer=fuzz.ratio,
+                                           limit=None, score_cutoff=60)
+            # Best 3 by (score, name), highest first - difflib's tie order
+            best = sorted(((score, match) for match, score, index in matches), reverse=True)[:3]
+            return [match for score, match in best]
+        
+        return get_close_matches(wrong_name, candidates, n=3, cutoff=0.6)
+    
     def add_error(self, message: str, line: int, column: int = 1, 
                   phase: str = "Compilation", wrong_name: str = None):
-        """Add a new error with optional suggestions"""
+        """Add a new error with optional suggestions
+        
+        Suggestions for wrong_name are filled in by finalize_suggestions(),
+        from the identifiers known when the error was reported. An error
+        identical to one already reported is ignored.
+        """
+        key = (message, line, column, phase)
+        if key in self._error_keys:
+            return
+        self._error_keys.add(key)
+        
         source_line = self.get_source_line(line)
-        error = CompilerError(message, line, column, source_line, phase)
+        error = CompilerError(message, line, column, source_line, phase, wrong_name=wrong_name)
         
-        # Add suggestions if we have a wrong identifier
+        # Defer the fuzzy search so all misspelled names are matched in one batch
         if wrong_name:
-            suggestions = self.find_suggestions(wrong_name)
+            self._pending_suggestions.append((error, len(self._identifier_order)))
+        
+        self._errors.append(error)
+    
+    def finalize_suggestions(self):
+        """Attach 'Did you mean...?' suggestions to all pending errors"""
+        if not self._pending_suggestions:
+            return
+        
+        # Errors reported before later add_identifier calls only see the
+        # identifiers known at the time; the rest share the current pool
+        pool_size = len(self._identifier_order)
+        names = list(dict.fromkeys(error.wrong_name for error, size in self._pending_suggestions
+                                   if size == pool_size and error.wrong_name not in self._suggestion_cache))
+        if len(names) > 1 and fuzz_process is not None:
+            self._batch_suggestions(names)
+        
+        earlier_pools: Dict[int, Set[str]] = {}
+        for error, size in self._pending_suggestions:
+            if size == pool_size:
+                suggestions = self.find_suggestions(error.wrong_name)
+            else:
+                pool = earlier_pools.get(size)
+                if pool is None:
+                    pool = earlier_pools[size] = set(self._identifier_order[:size]) | self.known_keywords
+                suggestions = self.find_suggestions(error.wrong_name, search_in=pool)
             for sug in suggestions:
                 error.add_suggestion(sug)
+        self._pending_suggestions.clear()
+    
+    def _batch_suggestions(self, names: List[str]):
+        """Score many misspelled names at once with RapidFuzz's cdist"""
+        candidates = self._get_candidates()
+        try:
+            scores = fuzz_process.cdist(names, candidates, scorer=fuzz.ratio,
+                                        score_cutoff=60, workers=-1)
+        except ImportError:
+            return  # cdist needs NumPy - find_suggestions handles each name instead
         
-        self.errors.append(error)
+        # Scores under the cutoff come back as 0
+        for name, row in zip(names, scores):
+            hits = sorted(row.nonzero()[0], key=lambda i: (row[i], candidates[i]), reverse=True)[:3]
+            self._remember_suggestions(name, [candidates[i] for i in hits])
     
     def add_warning(self, message: str, line: int = 0):
         """Add a warning message"""
@@ -98,37 +372,32 @@ class ErrorHandler:
     
     def has_errors(self) -> bool:
         """Check if any errors were collected"""
-        return len(self.errors) > 0
+        return len(self._errors) > 0
     
     def get_error_summary(self) -> str:
         """Generate a comprehensive error report"""
         if not self.errors and not self.warnings:
-            return "✅ No errors or warnings\n"
+            return f"{_MARK_OK} No errors or warnings\n"
         
-        report = "\n"
+        report = ["\n"]
         
         if self.errors:
-            report += f"{'='*70}\n"
-            report += f"  ❌ COMPILATION FAILED - {len(self.errors)} ERROR(S) FOUND\n"
-            report += f"{'='*70}\n"
-            
-            for i, error in enumerate(self.errors, 1):
-                report += f"\n[Error {i}/{len(self.errors)}]\n"
-                report += str(error)
+            total = len(self.errors)
+            report.append(_SUMMARY_ERRORS_HEADER.format(count=total))
+            report.extend(f"\n[Error {i}/{total}]\n{error}" for i, error in enumerate(self.errors, 1))
         
         if self.warnings:
-            report += f"\n{'='*70}\n"
-            report += f"  ⚠️  WARNINGS ({len(self.warnings)})\n"
-            report += f"{'='*70}\n"
-            for warning in self.warnings:
-                report += f"  • {warning}\n"
+            report.append(_SUMMARY_WARNINGS_HEADER.format(count=len(self.warnings)))
+            report.extend(f"  {_BULLET} {warning}\n" for warning in self.warnings)
         
-        return report
+        return "".join(report)
     
     def clear(self):
         """Clear all errors and warnings"""
-        self.errors.clear()
+        self._errors.clear()
+        self._error_keys.clear()
         self.warnings.clear()
+        self._pending_suggestions.clear()
 
 
 # Global error handler instance
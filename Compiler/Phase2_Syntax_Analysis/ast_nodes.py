@@ -3,28 +3,45 @@
 # ============================================================================
 # This module defines all Abstract Syntax Tree node classes
 # Each node represents a syntactic construct in CalcScript+
+# Nodes use __slots__ (no per-instance __dict__) to keep large trees small
+# Nodes compare by identity; the full field __repr__ is only generated when
+# CALCSCRIPT_DEBUG_AST is set (a nested repr walks the whole subtree)
 
-from dataclasses import dataclass
+import os
+import sys
+from dataclasses import dataclass, field
 from typing import List, Optional, Any
 
 
+_DEBUG_REPR = bool(os.environ.get('CALCSCRIPT_DEBUG_AST'))
+
+
+def _repr(self):
+    return f"{type(self).__name__}(...)"
+
+
 # Base class for all AST nodes
 class ASTNode:
     """Base class for all AST nodes"""
-    pass
+    __slots__ = ()
+    __repr__ = _repr
+    
+    # Source position; node kinds without line/column fields fall back to these
+    line = None
+    column = None
 
 
 # ============================================================================
 # STATEMENT NODES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class ProgramNode(ASTNode):
     """Root node representing the entire program"""
     statements: List[ASTNode]
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class VarDeclNode(ASTNode):
     """Variable declaration with type: int x = 10"""
     var_type: str  # int, long, float, string, boolean, array, matrix
@@ -32,9 +49,14 @@ class VarDeclNode(ASTNode):
     value: ASTNode
     line: int = 0
     column: int = 0
+    
+    def __post_init__(self):
+        # Intern recurring names so duplicates share one string object
+        self.var_type = sys.intern(self.var_type)
+        self.name = sys.intern(self.name)
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class AssignmentNode(ASTNode):
     """Assignment: x = 20 or arr[0] = 5"""
     name: str
@@ -42,9 +64,12 @@ class AssignmentNode(ASTNode):
     index: Optional[ASTNode] = None  # For array assignment
     line: int = 0
     column: int = 0
+    
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class PrintNode(ASTNode):
     """Print statement: dikhao x"""
     expression: ASTNode
@@ -52,13 +77,16 @@ class PrintNode(ASTNode):
     column: int = 0
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class InputNode(ASTNode):
     """Input statement: bolo x"""
     name: str
+    
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class IfNode(ASTNode):
     """If-else statement: agar condition: ... magar: ... khatam"""
     condition: ASTNode
@@ -66,21 +94,21 @@ class IfNode(ASTNode):
     else_block: Optional[List[ASTNode]] = None
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class RepeatNode(ASTNode):
     """Repeat loop: dubara kro 5 itni dafa: ... khatam"""
     count: ASTNode
     body: List[ASTNode]
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class WhileNode(ASTNode):
     """While loop: KrtayRaho condition: ... khatam"""
     condition: ASTNode
     body: List[ASTNode]
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class ForNode(ASTNode):
     """For loop: for int i = 0; i < 10; i = i + 1: ... end"""
     init: ASTNode  # Initialization statement (VarDeclNode or AssignmentNode)
@@ -89,28 +117,36 @@ class ForNode(ASTNode):
     body: List[ASTNode]
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class FuncDefNode(ASTNode):
     """Function definition: function int func(int a, int b): ... end"""
     return_type: str  # int, long, float, string, boolean, array, matrix
     name: str
     parameters: List[tuple]  # List of (type, name) tuples
     body: List[ASTNode]
+    # Set by the semantic analyzer: (return value type, ((name, value type), ...))
+    resolved_types: Optional[tuple] = field(default=None, init=False)
+    
+    def __post_init__(self):
+        self.return_type = sys.intern(self.return_type)
+        self.name = sys.intern(self.name)
+        self.parameters = [(sys.intern(param_type), sys.intern(param_name))
+                           for param_type, param_name in self.parameters]
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class ReturnNode(ASTNode):
     """Return statement: wapis value"""
     value: ASTNode
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class BreakNode(ASTNode):
     """Break statement: toro"""
     pass
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class ContinueNode(ASTNode):
     """Continue statement: ChaltayRho"""
     pass
@@ -120,7 +156,7 @@ class ContinueNode(ASTNode):
 # EXPRESSION NODES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class BinaryOpNode(ASTNode):
     """Binary operation: left op right"""
     operator: str
@@ -128,44 +164,53 @@ class BinaryOpNode(ASTNode):
     right: ASTNode
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class UnaryOpNode(ASTNode):
     """Unary operation: op operand"""
     operator: str
     operand: ASTNode
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class LiteralNode(ASTNode):
     """Literal value: number, string, or boolean"""
     value: Any
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class IdentifierNode(ASTNode):
     """Variable reference"""
     name: str
     line: int = 0
     column: int = 0
+    
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class ArrayLiteralNode(ASTNode):
     """Array literal: [1, 2, 3]"""
     elements: List[ASTNode]
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class ArrayAccessNode(ASTNode):
     """Array access: arr[index]"""
     name: str
     index: ASTNode
+    
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
 
 
-@dataclass
+@dataclass(slots=True, eq=False, repr=_DEBUG_REPR)
 class FuncCallNode(ASTNode):
     """Function call: func(arg1, arg2)"""
     name: str
     arguments: List[ASTNode]
     line: int = 0
     column: int = 0
+    
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
@@ -4,172 +4,497 @@
 # This module implements semantic analysis for CalcScript+
 # It performs type checking, scope resolution, and builds symbol tables
 
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Dict, List, Tuple, Optional, Any
 from ast_nodes import *
 
+# NumPy is optional - without it suggestions use the pure-Python edit distance.
+# Imported on the first large suggestion lookup; False records a failed import
+# so it is only attempted once.
+_np = None
+
+
+def _numpy():
+    """Return the numpy module, or None when it is not installed"""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _np = numpy
+    return _np or None
+
+
+# Value types used during checking, as small ints so comparisons are cheap
+TNUM, TSTR, TBOOL, TARR, TUNK, TVOID = range(6)
+_TYPE_NAMES = ('number', 'string', 'boolean', 'array', 'unknown', 'void')
+
+# Type keywords mapped to value types
+_TYPE_MAP = {
+    'int': TNUM,
+    'long': TNUM,
+    'float': TNUM,
+    'string': TSTR,
+    'boolean': TBOOL,
+    'array': TARR,
+    'matrix': TARR
+}
+_RETURN_TYPE_MAP = {**_TYPE_MAP, 'void': TVOID}
+
+# Accepted operand types (TUNK lets unresolved expressions through)
+_COND_TYPES = frozenset((TBOOL, TNUM, TUNK))  # Numbers allowed for truthiness
+_NUM_UNK = frozenset((TNUM, TUNK))
+_BOOL_UNK = frozenset((TBOOL, TUNK))
+_TRANSPOSE_ARG_TYPES = frozenset((TSTR, TNUM, TUNK))  # ^t or ^-1
+
+# Python types of literal values (exact types, so bool is not taken for int)
+_LITERAL_TYPES = {bool: TBOOL, int: TNUM, float: TNUM, str: TSTR}
+
+# Binary operator groups
+_ARITHMETIC_OPS = frozenset(('+', '-', '*', '/', '%', '^'))
+_MATRIX_OPS = frozenset(('+', '-', '*'))
+_COMPARISON_OPS = frozenset(('>', '<', '>=', '<='))
+_EQUALITY_OPS = frozenset(('==', '!='))
+_LOGICAL_OPS = frozenset(('and', 'or'))
+
+
+def _arithmetic_result(op: str, left_type: int, right_type: int) -> Optional[int]:
+    """Result type of an arithmetic operator, or None for invalid operands"""
+    if op == '+' and left_type == TSTR and right_type == TSTR:
+        return TSTR  # String concatenation
+    # Allow matrix operations with +, -, *
+    if op in _MATRIX_OPS and left_type == TARR and right_type == TARR:
+        return TARR  # Matrix operations
+    # Allow matrix transpose (^t) and inverse (^-1)
+    if op == '^' and left_type == TARR:
+        if right_type in _TRANSPOSE_ARG_TYPES:  # ^t or ^-1
+            return TARR
+    # Allow unknown types (from function calls) to pass through
+    if left_type in _NUM_UNK and right_type in _NUM_UNK:
+        return TNUM
+    return None
+
+
+def _comparison_result(op: str, left_type: int, right_type: int) -> Optional[int]:
+    """Result type of a comparison operator, or None for invalid operands"""
+    # Allow unknown types (from function calls, complex expressions) to pass through
+    if left_type in _NUM_UNK and right_type in _NUM_UNK:
+        return TBOOL
+    return None
+
+
+def _equality_result(op: str, left_type: int, right_type: int) -> Optional[int]:
+    """Result type of an equality operator (any operands)"""
+    return TBOOL
+
+
+def _logical_result(op: str, left_type: int, right_type: int) -> Optional[int]:
+    """Result type of a logical operator, or None for invalid operands"""
+    # Allow unknown types to pass through (they might be boolean from complex expressions)
+    if left_type in _BOOL_UNK and right_type in _BOOL_UNK:
+        return TBOOL
+    return None
+
+
+# Binary operator -> (result type rule, type assumed after an invalid use)
+_BINARY_RULES = {}
+_BINARY_RULES.update(dict.fromkeys(_ARITHMETIC_OPS, (_arithmetic_result, TNUM)))
+_BINARY_RULES.update(dict.fromkeys(_COMPARISON_OPS, (_comparison_result, TBOOL)))
+_BINARY_RULES.update(dict.fromkeys(_EQUALITY_OPS, (_equality_result, TBOOL)))
+_BINARY_RULES.update(dict.fromkeys(_LOGICAL_OPS, (_logical_result, TBOOL)))
+
+
+# Candidate count from which one NumPy pass beats a Python loop per candidate
+_VECTOR_MIN_CANDIDATES = 32
+
+
+def _levenshtein(s1: str, s2: str) -> int:
+    """Calculate edit distance between two strings"""
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if len(s2) == 0:
+        return len(s1)
+    
+    previous_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+    
+    return previous_row[-1]
+
+
+def _levenshtein_many(word: str, candidates: List[str]):
+    """Edit distance from word to every candidate, as a NumPy array (NumPy must be installed)
+    
+    Runs the Wagner-Fischer recurrence on all candidates at once: one row
+    update per character of word, each a handful of whole-array operations.
+    """
+    np = _numpy()
+    count = len(candidates)
+    lengths = np.fromiter(map(len, candidates), dtype=np.intp, count=count)
+    width = int(lengths.max())
+    
+    # Code points, zero-padded; padding only affects columns past each length
+    chars = np.zeros((count, width), dtype=np.uint32)
+    for row, candidate in enumerate(candidates):
+        chars[row, :len(candidate)] = np.frombuffer(candidate.encode('utf-32-le'), dtype=np.uint32)
+    
+    columns = np.arange(width + 1, dtype=np.int32)
+    previous = np.tile(columns, (count, 1))
+    current = np.empty_like(previous)
+    for i, ch in enumerate(word, 1):
+        # Substitution or deletion from the previous row
+        current[:, 0] = i
+        np.minimum(previous[:, :-1] + (chars != ord(ch)), previous[:, 1:] + 1, out=current[:, 1:])
+        # Insertions chain along the row: min over k <= j of (current[k] + j - k)
+        np.minimum.accumulate(current - columns, axis=1, out=current)
+        current += columns
+        previous, current = current, previous
+    
+    return previous[np.arange(count), lengths]
+
+
+class SemanticError(Exception):
+    """Semantic analysis failure; the report text is only built when str() is called"""
+    
+    __slots__ = ('errors', 'suppressed_errors')
+    
+    def __init__(self, errors: List[Dict[str, Any]], suppressed_errors: int = 0):
+        super().__init__()
+        self.errors = errors  # Structured error dicts from SemanticAnalyzer.error()
+        self.suppressed_errors = suppressed_errors
+    
+    def __str__(self):
+        report = ["Semantic analysis failed:"]
+        for i, err in enumerate(self.errors, 1):
+            report.append("\n\n")
+            report.append(f"Error {i}:")
+            if err['line']:
+                report.append(f" Line {err['line']}")
+                if err['column']:
+                    report.append(f", Column {err['column']}")
+            report.append(f"\n  {self.describe(err)}")
+            if err.get('suggestion'):
+                report.append(f"\n  💡 Suggestion: {err['suggestion']}")
+        
+        if self.suppressed_errors:
+            report.append(f"\n\n... and {self.suppressed_errors} more error(s) not shown")
+        
+        return "".join(report)
+    
+    @staticmethod
+    def describe(err: Dict[str, Any]) -> str:
+        """Message of an error followed by its context, as the report shows it"""
+        context = SemanticError._context(err)
+        return f"{err['message']} ({context})" if context else err['message']
+    
+    @staticmethod
+    def _context(err: Dict[str, Any]) -> str:
+        """Context text of an error, from the function and loop state it recorded"""
+        context_parts = []
+        if err.get('function'):
+            context_parts.append(f"in function '{err['function']}'")
+        if err.get('in_loop'):
+            context_parts.append("in loop")
+        return " ".join(context_parts)
+
+
+class ExprText:
+    """Readable text of an initializer expression, formatted on first str()
+    
+    Declarations keep one of these as their init_value, so programs whose
+    symbol table is never displayed skip the formatting entirely.
+    """
+    
+    __slots__ = ('node', 'formatter', 'text')
+    
+    def __init__(self, node: ASTNode, formatter):
+        self.node = node
+        self.formatter = formatter  # Callable turning the node into text
+        self.text = None
+    
+    def __str__(self):
+        if self.text is None:
+            self.text = self.formatter(self.node)
+            self.node = self.formatter = None  # Drop the subtree once formatted
+        return self.text
+    
+    def __repr__(self):
+        return repr(str(self))
+    
+    def __eq__(self, other):
+        return str(self) == (str(other) if isinstance(other, ExprText) else other)
+    
+    def __hash__(self):
+        return hash(str(self))
+
+
+@dataclass(slots=True)
+class Symbol:
+    """A variable or function entry in a SymbolTable"""
+    kind: str  # 'variable' or 'function'
+    value_type: int  # TNUM, TSTR, TBOOL, TARR, ...
+    scope_level: int
+    init_value: Any = None  # Initial value or expression
+    line_number: Optional[int] = None  # Line where declared
+    is_initialized: bool = False
+    is_used: bool = False  # Track if variable is used
+    return_type: Optional[str] = None  # Declared return type of functions
+
 
 class SymbolTable:
-    """Symbol table for tracking variables and functions"""
+    """Symbol table for tracking variables and functions
     
-    def __init__(self, parent: Optional['SymbolTable'] = None):
-        self.symbols: Dict[str, Dict[str, Any]] = {}
-        self.parent = parent
-        self.scope_level = 0 if parent is None else parent.scope_level + 1
+    Scopes are a stack of name -> Symbol dicts (global first, innermost last);
+    dicts of exited scopes are cleared and reused for the next block.
+    visible maps every name in reach to its innermost Symbol, so a lookup is
+    one dict probe whatever the nesting depth.
+    """
     
-    def define(self, name: str, symbol_type: str, value_type: str = None, init_value=None, line_number=None):
-        """Define a new symbol in the current scope"""
-        if name in self.symbols:
-            raise NameError(f"Symbol '{name}' already defined in current scope")
-        self.symbols[name] = {
-            'type': symbol_type,  # 'variable' or 'function'
-            'value_type': value_type,  # 'number', 'string', 'boolean', 'array'
-            'scope_level': self.scope_level,
-            'init_value': init_value,  # Initial value or expression
-            'line_number': line_number,  # Line where declared
-            'is_initialized': init_value is not None,
-            'is_used': False  # Track if variable is used
-        }
+    __slots__ = ('scopes', 'symbols', 'scope_level', 'visible', '_free_scopes')
+    
+    def __init__(self):
+        self.scopes: List[Dict[str, Symbol]] = [{}]
+        self.symbols = self.scopes[0]  # Innermost scope
+        self.scope_level = 0
+        self.visible: Dict[str, Symbol] = {}
+        self._free_scopes: List[Dict[str, Symbol]] = []
+    
+    @property
+    def global_symbols(self) -> Dict[str, Symbol]:
+        """Symbols of the outermost (global) scope"""
+        return self.scopes[0]
+    
+    def enter_scope(self):
+        """Push a new innermost scope"""
+        self.symbols = self._free_scopes.pop() if self._free_scopes else {}
+        self.scopes.append(self.symbols)
+        self.scope_level += 1
     
-    def mark_used(self, name: str):
-        """Mark a symbol as used"""
-        symbol = self.lookup(name)
-        if symbol and name in self.symbols:
-            self.symbols[name]['is_used'] = True
-        elif symbol and self.parent:
-            self.parent.mark_used(name)
+    def exit_scope(self):
+        """Pop the innermost scope (the global scope is never popped)"""
+        if self.scope_level:
+            scope = self.scopes.pop()
+            self.symbols = self.scopes[-1]
+            self.scope_level -= 1
+            
+            # Names declared in the block now resolve to an outer symbol, if any
+            visible = self.visible
+            for name in scope:
+                for outer in reversed(self.scopes):
+                    symbol = outer.get(name)
+                    if symbol is not None:
+                        visible[name] = symbol
+                        break
+                else:
+                    del visible[name]
+            
+            scope.clear()
+            self._free_scopes.append(scope)
     
-    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
-        """Look up a symbol in current scope or parent scopes"""
+    def define(self, name: str, symbol_type: str, value_type: int = None, init_value=None, line_number=None):
+        """Define a new symbol in the current scope"""
         if name in self.symbols:
-            return self.symbols[name]
-        elif self.parent:
-            return self.parent.lookup(name)
-        return None
+            raise NameError(f"Symbol '{name}' already defined in current scope")
+        symbol = Symbol(symbol_type, value_type, self.scope_level, init_value,
+                        line_number, is_initialized=init_value is not None)
+        self.symbols[name] = symbol
+        self.visible[name] = symbol
+    
+    def define_bulk(self, items: List[Tuple[str, int]]):
+        """Define (name, value_type) variables in a fresh scope, e.g. function parameters"""
+        level = self.scope_level
+        defined = {name: Symbol('variable', value_type, level) for name, value_type in items}
+        self.symbols.update(defined)
+        self.visible.update(defined)
+        if len(self.symbols) != len(items):
+            seen = set()
+            for name, _ in items:
+                if name in seen:
+                    raise NameError(f"Symbol '{name}' already defined in current scope")
+                seen.add(name)
+    
+    def define_global(self, name: str, symbol: Symbol):
+        """Bind (or rebind) a symbol in the global scope, e.g. a function"""
+        self.scopes[0][name] = symbol
+        current = self.visible.get(name)
+        if current is None or current.scope_level == 0:  # Not shadowed by a local
+            self.visible[name] = symbol
+    
+    def lookup(self, name: str) -> Optional[Symbol]:
+        """Look up a symbol in current scope or enclosing scopes"""
+        return self.visible.get(name)
     
     def exists(self, name: str) -> bool:
         """Check if symbol exists in any scope"""
-        return self.lookup(name) is not None
+        return name in self.visible
 
 
 class SemanticAnalyzer:
     """Semantic analyzer for CalcScript+"""
     
-    def __init__(self):
-        self.global_scope = SymbolTable()
-        self.current_scope = self.global_scope
+    MAX_ERRORS = 100  # Errors kept for the report; later ones are only counted
+    
+    __slots__ = ('symbol_table', 'in_function', 'in_loop', 'errors',
+                 'suppressed_errors', 'track_symbols', 'all_symbols', 'current_node',
+                 'current_function', '_symbol_infos', '_candidate_names', '_suggest_cache')
+    
+    def __init__(self, track_symbols: bool = True):
+        """track_symbols=False leaves all_symbols empty (nothing will display it)"""
+        self.symbol_table = SymbolTable()
         self.in_function = False
         self.in_loop = False
         self.errors: List[Dict[str, Any]] = []  # Store structured error info
+        self.suppressed_errors = 0  # Errors reported after MAX_ERRORS was reached
+        self.track_symbols = track_symbols
         self.all_symbols = []  # Track all symbols across all scopes
+        self._symbol_infos: Dict[str, List[Dict[str, Any]]] = {}  # all_symbols entries by name
+        self._candidate_names: Dict[str, List[str]] = {'variable': [], 'function': []}
+        self._suggest_cache: Dict[Tuple[str, str], Optional[str]] = {}
         self.current_node = None  # Track current node being analyzed
         self.current_function = None  # Track current function name
         
+        # Visitor dispatch tables, built once per class and shared by all instances
+        cls = type(self)
+        if '_dispatch' not in cls.__dict__:
+            cls._visitors = cls._build_dispatch()
+            cls._dispatch = {}  # Node class -> visitor, filled on first visit
+        
         # No built-in functions - users must define everything themselves
     
     def error(self, message: str, node: ASTNode = None, suggestion: str = None):
         """Record a semantic error with location information"""
+        if len(self.errors) >= self.MAX_ERRORS:
+            self.suppressed_errors += 1
+            return
+        
         # Use provided node or current node
         error_node = node if node else self.current_node
         
         # Get line and column if available
-        line = getattr(error_node, 'line', 0) if error_node else 0
-        column = getattr(error_node, 'column', 0) if error_node else 0
+        line = (error_node.line or 0) if error_node else 0
+        column = (error_node.column or 0) if error_node else 0
         
         error_info = {
             'message': message,
             'line': line,
             'column': column,
             'suggestion': suggestion,
-            'context': self._get_error_context()
+            'function': self.current_function,  # Context, only turned into text
+            'in_loop': self.in_loop              # when the report is formatted
         }
         self.errors.append(error_info)
     
-    def _get_error_context(self) -> str:
-        """Get context information for error message"""
-        context_parts = []
-        if self.current_function:
-            context_parts.append(f"in function '{self.current_function}'")
-        if self.in_loop:
-            context_parts.append("in loop")
-        return " ".join(context_parts) if context_parts else ""
+    def _track_symbol(self, name: str, info: Dict[str, Any]):
+        """Record a symbol in all_symbols and in the suggestion candidates"""
+        self.all_symbols.append((name, info))
+        self._symbol_infos.setdefault(name, []).append(info)
+        if info['type'] in self._candidate_names:
+            self._add_candidate(name, info['type'])
+    
+    def _add_candidate(self, name: str, kind: str):
+        """Offer a declared name as a suggestion for misspelled names of its kind"""
+        self._candidate_names[kind].append(name)
+        self._suggest_cache.clear()  # A new candidate can change any suggestion
     
     def enter_scope(self):
         """Enter a new scope"""
-        self.current_scope = SymbolTable(self.current_scope)
+        self.symbol_table.enter_scope()
     
     def exit_scope(self):
         """Exit current scope"""
-        if self.current_scope.parent:
-            self.current_scope = self.current_scope.parent
+        self.symbol_table.exit_scope()
     
     def analyze(self, node: ASTNode):
         """Main analysis entry point"""
         self.visit(node)
         
         if self.errors:
-            error_messages = []
-            for i, err in enumerate(self.errors, 1):
-                msg = f"Error {i}:"
-                if err['line']:
-                    msg += f" Line {err['line']}"
-                    if err['column']:
-                        msg += f", Column {err['column']}"
-                msg += f"\n  {err['message']}"
-                if err.get('context'):
-                    msg += f" ({err['context']})"
-                if err.get('suggestion'):
-                    msg += f"\n  💡 Suggestion: {err['suggestion']}"
-                error_messages.append(msg)
-            
-            full_error = "Semantic analysis failed:\n\n" + "\n\n".join(error_messages)
-            raise Exception(full_error)
+            raise SemanticError(self.errors, self.suppressed_errors)
     
     def get_expr_string(self, node) -> str:
         """Convert expression node to readable string"""
         if node is None:
             return 'null'
         
-        node_class = node.__class__.__name__
+        node_class = node.__class__
         
-        if node_class == 'NumberNode':
-            return str(node.value)
-        elif node_class == 'StringNode':
-            return f'"{node.value}"'
-        elif node_class == 'BooleanNode':
-            return str(node.value).lower()
-        elif node_class == 'IdentifierNode':
+        if node_class is IdentifierNode:
             return node.name
-        elif node_class == 'BinaryOpNode':
+        elif node_class is BinaryOpNode:
             left = self.get_expr_string(node.left)
             right = self.get_expr_string(node.right)
             return f"({left} {node.operator} {right})"
-        elif node_class == 'UnaryOpNode':
+        elif node_class is UnaryOpNode:
             operand = self.get_expr_string(node.operand)
             return f"{node.operator}({operand})"
-        elif node_class == 'ArrayLiteralNode':
-            if hasattr(node, 'elements'):
-                elements = [self.get_expr_string(e) for e in node.elements]
-                return f"[{', '.join(elements)}]"
-            return '[]'
-        elif node_class == 'FunctionCallNode':
-            args = [self.get_expr_string(a) for a in node.arguments]
-            return f"{node.name}({', '.join(args)})"
+        elif node_class is ArrayLiteralNode:
+            elements = [self.get_expr_string(e) for e in node.elements]
+            return f"[{', '.join(elements)}]"
         else:
-            return f"<{node_class}>"
+            return f"<{node_class.__name__}>"
     
-    def visit(self, node: ASTNode) -> str:
+    def visit(self, node: ASTNode) -> int:
         """Visit a node and return its type"""
         # Track current node for better error reporting
         old_node = self.current_node
         self.current_node = node
         
-        method_name = f'visit_{node.__class__.__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        result = visitor(node)
+        node_class = type(node)
+        visitor = self._dispatch.get(node_class) or self._visitor_for(node_class)
+        result = visitor(self, node)
         
         self.current_node = old_node
         return result
     
+    @classmethod
+    def _build_dispatch(cls) -> Dict[str, Any]:
+        """Map node class names to the unbound visit_* methods of cls"""
+        dispatch = {}
+        for klass in reversed(cls.__mro__):
+            for attr, method in vars(klass).items():
+                if attr.startswith('visit_'):
+                    dispatch[attr[len('visit_'):]] = method
+        return dispatch
+    
+    def _visitor_for(self, node_class: type):
+        """Resolve the unbound visitor for a node class and cache it by class"""
+        visitor = self._visitors.get(node_class.__name__, type(self).generic_visit)
+        self._dispatch[node_class] = visitor
+        return visitor
+    
+    def _visit_block(self, statements: List[ASTNode]):
+        """Visit a statement list, resolving the visitor once per run of same-class statements"""
+        old_node = self.current_node
+        dispatch = self._dispatch
+        
+        for node_class, run in groupby(statements, key=type):
+            visitor = dispatch.get(node_class) or self._visitor_for(node_class)
+            for node in run:
+                self.current_node = node
+                visitor(self, node)
+        
+        self.current_node = old_node
+    
+    def _visit_scoped_block(self, statements: List[ASTNode], in_loop: bool = False):
+        """Visit a statement list in its own scope, as a loop body if in_loop is set"""
+        if not statements:
+            return  # Nothing can be declared in an empty block, skip the scope
+        
+        old_in_loop = self.in_loop
+        self.in_loop = old_in_loop or in_loop
+        self.enter_scope()
+        self._visit_block(statements)
+        self.exit_scope()
+        self.in_loop = old_in_loop
+    
     def generic_visit(self, node: ASTNode):
         """Default visitor for unhandled nodes"""
         raise Exception(f"No visit method for {node.__class__.__name__}")
@@ -179,195 +504,180 @@ class SemanticAnalyzer:
         if not candidates:
             return None
         
-        def levenshtein_distance(s1: str, s2: str) -> int:
-            """Calculate edit distance between two strings"""
-            if len(s1) < len(s2):
-                return levenshtein_distance(s2, s1)
-            if len(s2) == 0:
-                return len(s1)
-            
-            previous_row = range(len(s2) + 1)
-            for i, c1 in enumerate(s1):
-                current_row = [i + 1]
-                for j, c2 in enumerate(s2):
-                    insertions = previous_row[j + 1] + 1
-                    deletions = current_row[j] + 1
-                    substitutions = previous_row[j] + (c1 != c2)
-                    current_row.append(min(insertions, deletions, substitutions))
-                previous_row = current_row
-            
-            return previous_row[-1]
+        wrong_name = wrong_name.lower()
+        wrong_length = len(wrong_name)
+        
+        # The distance is at least the length difference, so skip hopeless candidates
+        plausible = []
+        lowered = []
+        for candidate in candidates:
+            lowered_candidate = candidate.lower()
+            if abs(len(lowered_candidate) - wrong_length) <= 3:
+                plausible.append(candidate)
+                lowered.append(lowered_candidate)
+        candidates = plausible
+        
+        # Many candidates: one vectorized pass scores all of them at once
+        if len(lowered) >= _VECTOR_MIN_CANDIDATES and _numpy() is not None:
+            distances = _levenshtein_many(wrong_name, lowered)
+            best = int(distances.argmin())  # First candidate with the minimum
+            return candidates[best] if distances[best] <= 3 else None
         
         # Find candidate with minimum distance
         best_match = None
         min_distance = float('inf')
         
-        for candidate in candidates:
-            distance = levenshtein_distance(wrong_name.lower(), candidate.lower())
+        for candidate, lowered_candidate in zip(candidates, lowered):
+            distance = _levenshtein(wrong_name, lowered_candidate)
             if distance < min_distance and distance <= 3:  # Only suggest if distance <= 3
                 min_distance = distance
                 best_match = candidate
         
         return best_match
     
+    def _suggestion_for(self, wrong_name: str, kind: str, fallback: str) -> Optional[str]:
+        """Suggestion text for an undeclared name of the given kind ('variable' or 'function')"""
+        if len(self.errors) >= self.MAX_ERRORS:
+            return None  # The error will only be counted, skip the similarity search
+        
+        key = (wrong_name, kind)
+        if key in self._suggest_cache:
+            suggestion = self._suggest_cache[key]
+        else:
+            suggestion = self._find_similar_name(wrong_name, self._candidate_names[kind])
+            self._suggest_cache[key] = suggestion
+        return f"Did you mean '{suggestion}'?" if suggestion else fallback
+    
     # ========================================================================
     # STATEMENT VISITORS
     # ========================================================================
     
-    def visit_ProgramNode(self, node: ProgramNode) -> str:
+    def visit_ProgramNode(self, node: ProgramNode) -> int:
         """Visit program node"""
-        for statement in node.statements:
-            self.visit(statement)
-        return 'void'
+        self._visit_block(node.statements)
+        return TVOID
     
-    def visit_VarDeclNode(self, node: VarDeclNode) -> str:
+    def visit_VarDeclNode(self, node: VarDeclNode) -> int:
         """Visit variable declaration with type"""
         # Check if variable already exists in current scope
-        if node.name in self.current_scope.symbols:
-            prev_decl = self.current_scope.symbols[node.name]
-            line_info = f" (previously declared at line {prev_decl.get('line_number')})" if prev_decl.get('line_number') else ""
+        if node.name in self.symbol_table.symbols:
+            prev_decl = self.symbol_table.symbols[node.name]
+            line_info = f" (previously declared at line {prev_decl.line_number})" if prev_decl.line_number else ""
             self.error(f"Variable '{node.name}' is already declared in this scope{line_info}", node, 
                       "Use a different variable name or remove the duplicate declaration.")
-            return 'void'
+            return TVOID
         
         # Get type of initialization expression
         value_type = self.visit(node.value)
         
         # Map type keywords to value types
-        type_map = {
-            'int': 'number',
-            'long': 'number',
-            'float': 'number',
-            'string': 'string',
-            'boolean': 'boolean',
-            'array': 'array',
-            'matrix': 'array'
-        }
-        
-        declared_type = type_map.get(node.var_type, 'unknown')
+        declared_type = _TYPE_MAP.get(node.var_type, TUNK)
         
         # Type checking: ensure value matches declared type
-        if declared_type != 'unknown' and value_type != 'unknown':
-            if declared_type != value_type and not (declared_type == 'number' and value_type == 'number'):
-                self.error(f"Type mismatch: variable '{node.name}' declared as {node.var_type} but assigned {value_type}")
+        if declared_type != TUNK and value_type != TUNK:
+            if declared_type != value_type and not (declared_type == TNUM and value_type == TNUM):
+                self.error(f"Type mismatch: variable '{node.name}' declared as {node.var_type} but assigned {_TYPE_NAMES[value_type]}")
         
-        # Get initialization expression as string
-        init_expr = self.get_expr_string(node.value)
+        # Initialization expression, formatted as text only when displayed
+        init_expr = ExprText(node.value, self.get_expr_string)
         
         # Get line number if available
-        line_num = getattr(node, 'line', None)
+        line_num = node.line
         
         # Define variable in symbol table with comprehensive info
-        self.current_scope.define(node.name, 'variable', declared_type, init_expr, line_num)
+        self.symbol_table.define(node.name, 'variable', declared_type, init_expr, line_num)
         
         # Track this symbol in all_symbols list
-        self.all_symbols.append((node.name, {
-            'type': 'variable',
-            'value_type': declared_type,
-            'scope_level': self.current_scope.scope_level,
-            'init_value': init_expr,
-            'line_number': line_num,
-            'is_initialized': True,
-            'is_used': False
-        }))
-        
-        return 'void'
-    
-    def visit_AssignmentNode(self, node: AssignmentNode) -> str:
+        if self.track_symbols:
+            self._track_symbol(node.name, {
+                'type': 'variable',
+                'value_type': _TYPE_NAMES[declared_type],
+                'scope_level': self.symbol_table.scope_level,
+                'init_value': init_expr,
+                'line_number': line_num,
+                'is_initialized': True,
+                'is_used': False
+            })
+        else:
+            self._add_candidate(node.name, 'variable')
+        
+        return TVOID
+    
+    def visit_AssignmentNode(self, node: AssignmentNode) -> int:
         """Visit assignment"""
         # Check if variable exists
-        if not self.current_scope.exists(node.name):
+        if self.symbol_table.lookup(node.name) is None:
             # Find similar variable names for suggestions
-            all_vars = [name for name, info in self.all_symbols if info.get('type') == 'variable']
-            suggestion = self._find_similar_name(node.name, all_vars)
-            suggestion_msg = f"Did you mean '{suggestion}'?" if suggestion else "Declare the variable before assigning to it."
+            suggestion_msg = self._suggestion_for(node.name, 'variable',
+                                                  "Declare the variable before assigning to it.")
             
             self.error(f"Variable '{node.name}' is not declared", node, suggestion_msg)
-            return 'void'
+            return TVOID
         
         # For array assignment, check index
         if node.index:
             index_type = self.visit(node.index)
-            if index_type != 'number':
-                self.error(f"Array index must be a number, got {index_type}")
+            if index_type != TNUM:
+                self.error(f"Array index must be a number, got {_TYPE_NAMES[index_type]}")
         
         # Check value type
         self.visit(node.value)
-        return 'void'
+        return TVOID
     
-    def visit_PrintNode(self, node: PrintNode) -> str:
+    def visit_PrintNode(self, node: PrintNode) -> int:
         """Visit print statement - supports single or multiple expressions"""
         # Handle both single expression and list of expressions
         if isinstance(node.expression, list):
+            visit = self.visit
             for expr in node.expression:
-                self.visit(expr)
+                visit(expr)
         else:
             self.visit(node.expression)
-        return 'void'
+        return TVOID
     
-    def visit_InputNode(self, node: InputNode) -> str:
+    def visit_InputNode(self, node: InputNode) -> int:
         """Visit input statement"""
         # Define variable if it doesn't exist
-        if not self.current_scope.exists(node.name):
-            self.current_scope.define(node.name, 'variable', 'string')
-        return 'void'
+        if self.symbol_table.lookup(node.name) is None:
+            self.symbol_table.define(node.name, 'variable', TSTR)
+        return TVOID
     
-    def visit_IfNode(self, node: IfNode) -> str:
+    def visit_IfNode(self, node: IfNode) -> int:
         """Visit if statement"""
         # Check condition type
         cond_type = self.visit(node.condition)
-        if cond_type not in ('boolean', 'number', 'unknown'):  # Allow numbers for truthiness
-            self.error(f"If condition must be boolean, got {cond_type}")
+        if cond_type not in _COND_TYPES:  # Allow numbers for truthiness
+            self.error(f"If condition must be boolean, got {_TYPE_NAMES[cond_type]}")
         
-        # Visit then block in new scope
-        self.enter_scope()
-        for stmt in node.then_block:
-            self.visit(stmt)
-        self.exit_scope()
-        
-        # Visit else block if present in new scope
+        # Visit then block and else block (if present) in new scopes
+        self._visit_scoped_block(node.then_block)
         if node.else_block:
-            self.enter_scope()
-            for stmt in node.else_block:
-                self.visit(stmt)
-            self.exit_scope()
-        return 'void'
+            self._visit_scoped_block(node.else_block)
+        return TVOID
     
-    def visit_RepeatNode(self, node: RepeatNode) -> str:
+    def visit_RepeatNode(self, node: RepeatNode) -> int:
         """Visit repeat loop"""
         # Check count type
         count_type = self.visit(node.count)
-        if count_type not in ('number', 'unknown'):
-            self.error(f"Repeat count must be a number, got {count_type}")
+        if count_type not in _NUM_UNK:
+            self.error(f"Repeat count must be a number, got {_TYPE_NAMES[count_type]}")
         
         # Visit body in new scope
-        old_in_loop = self.in_loop
-        self.in_loop = True
-        self.enter_scope()
-        for stmt in node.body:
-            self.visit(stmt)
-        self.exit_scope()
-        self.in_loop = old_in_loop
-        return 'void'
+        self._visit_scoped_block(node.body, in_loop=True)
+        return TVOID
     
-    def visit_WhileNode(self, node: WhileNode) -> str:
+    def visit_WhileNode(self, node: WhileNode) -> int:
         """Visit while loop"""
         # Check condition type
         cond_type = self.visit(node.condition)
-        if cond_type not in ('boolean', 'number', 'unknown'):
-            self.error(f"While condition must be boolean, got {cond_type}")
+        if cond_type not in _COND_TYPES:
+            self.error(f"While condition must be boolean, got {_TYPE_NAMES[cond_type]}")
         
         # Visit body in new scope
-        old_in_loop = self.in_loop
-        self.in_loop = True
-        self.enter_scope()
-        for stmt in node.body:
-            self.visit(stmt)
-        self.exit_scope()
-        self.in_loop = old_in_loop
-        return 'void'
+        self._visit_scoped_block(node.body, in_loop=True)
+        return TVOID
     
-    def visit_ForNode(self, node: ForNode) -> str:
+    def visit_ForNode(self, node: ForNode) -> int:
         """Visit for loop: for int i = 0; i < 10; i = i + 1: ... end"""
         # Enter new scope BEFORE initialization so loop variable is scoped to the loop
         old_in_loop = self.in_loop
@@ -379,65 +689,58 @@ class SemanticAnalyzer:
         
         # Check condition type
         cond_type = self.visit(node.condition)
-        if cond_type not in ('boolean', 'number', 'unknown'):
-            self.error(f"For loop condition must be boolean, got {cond_type}")
+        if cond_type not in _COND_TYPES:
+            self.error(f"For loop condition must be boolean, got {_TYPE_NAMES[cond_type]}")
         
         # Visit update statement
         self.visit(node.update)
         
         # Visit body (already in loop scope)
-        for stmt in node.body:
-            self.visit(stmt)
+        self._visit_block(node.body)
         
         # Exit scope
         self.exit_scope()
         self.in_loop = old_in_loop
-        return 'void'
+        return TVOID
     
-    def visit_FuncDefNode(self, node: FuncDefNode) -> str:
+    def visit_FuncDefNode(self, node: FuncDefNode) -> int:
         """Visit function definition with return type and typed parameters"""
         # Check if function already exists (but allow if it's a built-in being redefined)
-        existing = self.global_scope.symbols.get(node.name)
-        if existing and existing['type'] == 'function' and node.name not in ('sum', 'max', 'min'):
+        existing = self.symbol_table.global_symbols.get(node.name)
+        if existing and existing.kind == 'function' and node.name not in ('sum', 'max', 'min'):
             self.error(f"Function '{node.name}' already defined")
-            return 'void'
-        
-        # Map return type to value type
-        type_map = {
-            'int': 'number',
-            'long': 'number',
-            'float': 'number',
-            'string': 'string',
-            'boolean': 'boolean',
-            'array': 'array',
-            'matrix': 'array',
-            'void': 'void'
-        }
+            return TVOID
         
-        return_value_type = type_map.get(node.return_type, 'unknown')
+        # Map return and parameter types to value types (once per node)
+        if node.resolved_types is None:
+            node.resolved_types = (
+                _RETURN_TYPE_MAP.get(node.return_type, TUNK),
+                tuple((param_name, _RETURN_TYPE_MAP.get(param_type, TNUM))
+                      for param_type, param_name in node.parameters)
+            )
+        return_value_type, params = node.resolved_types
         
         # Get line number if available
-        line_num = getattr(node, 'line', None)
+        line_num = node.line
         
         # Define function in global scope (before visiting body to allow recursion)
-        self.global_scope.symbols[node.name] = {
-            'type': 'function',
-            'value_type': return_value_type,
-            'return_type': node.return_type,
-            'scope_level': 0,
-            'line_number': line_num
-        }
+        self.symbol_table.define_global(node.name, Symbol('function', return_value_type, 0,
+                                                          line_number=line_num,
+                                                          return_type=node.return_type))
         
         # Track this function in all_symbols list
-        self.all_symbols.append((node.name, {
-            'type': 'function',
-            'value_type': return_value_type,
-            'return_type': node.return_type,
-            'scope_level': 0,
-            'line_number': line_num,
-            'is_initialized': True,
-            'is_used': False
-        }))
+        if self.track_symbols:
+            self._track_symbol(node.name, {
+                'type': 'function',
+                'value_type': _TYPE_NAMES[return_value_type],
+                'return_type': node.return_type,
+                'scope_level': 0,
+                'line_number': line_num,
+                'is_initialized': True,
+                'is_used': False
+            })
+        else:
+            self._add_candidate(node.name, 'function')
         
         # Enter function scope
         self.enter_scope()
@@ -447,199 +750,215 @@ class SemanticAnalyzer:
         self.current_function = node.name
         
         # Define parameters with their types
-        for param_type, param_name in node.parameters:
-            param_value_type = type_map.get(param_type, 'number')
-            param_line = getattr(node, 'line', None)
-            self.current_scope.define(param_name, 'variable', param_value_type)
-            
-            # Track parameters in all_symbols
-            self.all_symbols.append((param_name, {
-                'type': 'parameter',
-                'value_type': param_value_type,
-                'scope_level': self.current_scope.scope_level,
-                'init_value': f'<param>',
-                'line_number': param_line,
-                'is_initialized': True,
-                'is_used': False
-            }))
+        self.symbol_table.define_bulk(params)
+        
+        # Track parameters in all_symbols
+        if self.track_symbols:
+            param_line = node.line
+            for param_name, param_value_type in params:
+                self._track_symbol(param_name, {
+                    'type': 'parameter',
+                    'value_type': _TYPE_NAMES[param_value_type],
+                    'scope_level': self.symbol_table.scope_level,
+                    'init_value': f'<param>',
+                    'line_number': param_line,
+                    'is_initialized': True,
+                    'is_used': False
+                })
         
         # Visit body
-        for stmt in node.body:
-            self.visit(stmt)
+        self._visit_block(node.body)
         
         # Exit function scope
         self.in_function = old_in_function
         self.current_function = old_function_name
         self.exit_scope()
-        return 'void'
+        return TVOID
     
-    def visit_ReturnNode(self, node: ReturnNode) -> str:
+    def visit_ReturnNode(self, node: ReturnNode) -> int:
         """Visit return statement"""
         if not self.in_function:
             self.error("Return statement outside function")
         
         self.visit(node.value)
-        return 'void'
+        return TVOID
     
-    def visit_BreakNode(self, node: BreakNode) -> str:
+    def visit_BreakNode(self, node: BreakNode) -> int:
         """Visit break statement"""
         if not self.in_loop:
             self.error("Break statement outside loop")
-        return 'void'
+        return TVOID
     
-    def visit_ContinueNode(self, node: ContinueNode) -> str:
+    def visit_ContinueNode(self, node: ContinueNode) -> int:
         """Visit continue statement"""
         if not self.in_loop:
             self.error("Continue statement outside loop")
-        return 'void'
+        return TVOID
     
     # ========================================================================
     # EXPRESSION VISITORS
     # ========================================================================
     
-    def visit_BinaryOpNode(self, node: BinaryOpNode) -> str:
+    def visit_BinaryOpNode(self, node: BinaryOpNode) -> int:
         """Visit binary operation"""
-        left_type = self.visit(node.left)
-        right_type = self.visit(node.right)
+        return self._visit_expression(node)
+    
+    def visit_UnaryOpNode(self, node: UnaryOpNode) -> int:
+        """Visit unary operation"""
+        return self._visit_expression(node)
+    
+    def _visit_expression(self, root: ASTNode) -> int:
+        """Type an operator/array-access expression without one Python frame per level
         
+        Nested BinaryOpNode, UnaryOpNode and ArrayAccessNode subtrees are walked
+        in postorder on an explicit stack; any other operand is handed straight to
+        its visitor from the dispatch table.
+        """
+        old_node = self.current_node
+        dispatch = self._dispatch
+        types: List[int] = []  # Types of finished operands
+        stack = [(root, False)]
+        
+        while stack:
+            node, operands_done = stack.pop()
+            cls = node.__class__
+            
+            if cls is BinaryOpNode:
+                if not operands_done:
+                    stack.append((node, True))
+                    stack.append((node.right, False))
+                    stack.append((node.left, False))
+                    continue
+                right_type = types.pop()
+                left_type = types.pop()
+                self.current_node = node
+                types.append(self._binary_type(node, left_type, right_type))
+            
+            elif cls is UnaryOpNode:
+                if not operands_done:
+                    stack.append((node, True))
+                    stack.append((node.operand, False))
+                    continue
+                self.current_node = node
+                types.append(self._unary_type(node, types.pop()))
+            
+            elif cls is ArrayAccessNode:
+                self.current_node = node
+                if not operands_done:
+                    # Check if array exists
+                    if self.symbol_table.lookup(node.name) is None:
+                        self.error(f"Array '{node.name}' not declared")
+                    stack.append((node, True))
+                    stack.append((node.index, False))
+                    continue
+                # Check index type
+                index_type = types.pop()
+                if index_type != TNUM:
+                    self.error(f"Array index must be a number, got {_TYPE_NAMES[index_type]}")
+                types.append(TUNK)  # We don't track element types
+            
+            else:
+                # No save/restore of current_node as in visit(): every operator
+                # step above sets it again before it can report an error
+                visitor = dispatch.get(cls) or self._visitor_for(cls)
+                self.current_node = node
+                types.append(visitor(self, node))
+        
+        self.current_node = old_node
+        return types[0]
+    
+    def _binary_type(self, node: BinaryOpNode, left_type: int, right_type: int) -> int:
+        """Result type of a binary operation on operands of the given types"""
         # Handle None types (shouldn't happen but be defensive)
         if left_type is None:
-            left_type = 'unknown'
+            left_type = TUNK
         if right_type is None:
-            right_type = 'unknown'
-        
-        # Arithmetic operators
-        if node.operator in ('+', '-', '*', '/', '%', '^'):
-            if node.operator == '+' and left_type == 'string' and right_type == 'string':
-                return 'string'  # String concatenation
-            # Allow matrix operations with +, -, *
-            if node.operator in ('+', '-', '*') and left_type == 'array' and right_type == 'array':
-                return 'array'  # Matrix operations
-            # Allow matrix transpose (^t) and inverse (^-1)
-            if node.operator == '^' and left_type == 'array':
-                if right_type in ('string', 'number', 'unknown'):  # ^t or ^-1
-                    return 'array'
-            # Allow unknown types (from function calls) to pass through
-            if left_type in ('number', 'unknown') and right_type in ('number', 'unknown'):
-                return 'number'
-            if left_type == 'number' and right_type == 'number':
-                return 'number'
-            self.error(f"Invalid operands for {node.operator}: {left_type} and {right_type}")
-            return 'number'
-        
-        # Comparison operators
-        elif node.operator in ('>', '<', '>=', '<='):
-            # Allow unknown types (from function calls, complex expressions) to pass through
-            if left_type in ('number', 'unknown') and right_type in ('number', 'unknown'):
-                return 'boolean'
-            self.error(f"Invalid operands for {node.operator}: {left_type} and {right_type}")
-            return 'boolean'
-        
-        # Equality operators
-        elif node.operator in ('==', '!='):
-            return 'boolean'
-        
-        # Logical operators
-        elif node.operator in ('and', 'or'):
-            # Allow unknown types to pass through (they might be boolean from complex expressions)
-            if left_type in ('boolean', 'unknown') and right_type in ('boolean', 'unknown'):
-                return 'boolean'
-            self.error(f"Invalid operands for {node.operator}: {left_type} and {right_type}")
-            return 'boolean'
-        
-        return 'unknown'
-    
-    def visit_UnaryOpNode(self, node: UnaryOpNode) -> str:
-        """Visit unary operation"""
-        operand_type = self.visit(node.operand)
+            right_type = TUNK
         
+        rule = _BINARY_RULES.get(node.operator)
+        if rule is None:
+            return TUNK
+        
+        check, fallback = rule
+        result_type = check(node.operator, left_type, right_type)
+        if result_type is None:
+            self.error(f"Invalid operands for {node.operator}: {_TYPE_NAMES[left_type]} and {_TYPE_NAMES[right_type]}")
+            return fallback
+        return result_type
+    
+    def _unary_type(self, node: UnaryOpNode, operand_type: int) -> int:
+        """Result type of a unary operation on an operand of the given type"""
         if node.operator == '-':
-            if operand_type == 'number':
-                return 'number'
-            self.error(f"Invalid operand for unary -: {operand_type}")
-            return 'number'
+            if operand_type == TNUM:
+                return TNUM
+            self.error(f"Invalid operand for unary -: {_TYPE_NAMES[operand_type]}")
+            return TNUM
         
         elif node.operator == 'not':
-            if operand_type == 'boolean':
-                return 'boolean'
-            self.error(f"Invalid operand for not: {operand_type}")
-            return 'boolean'
+            if operand_type == TBOOL:
+                return TBOOL
+            self.error(f"Invalid operand for not: {_TYPE_NAMES[operand_type]}")
+            return TBOOL
         
-        return 'unknown'
+        return TUNK
     
-    def visit_LiteralNode(self, node: LiteralNode) -> str:
+    def visit_LiteralNode(self, node: LiteralNode) -> int:
         """Visit literal"""
-        if isinstance(node.value, bool):
-            return 'boolean'
-        elif isinstance(node.value, (int, float)):
-            return 'number'
-        elif isinstance(node.value, str):
-            return 'string'
-        return 'unknown'
-    
-    def visit_IdentifierNode(self, node: IdentifierNode) -> str:
+        return _LITERAL_TYPES.get(type(node.value), TUNK)
+    
+    def visit_IdentifierNode(self, node: IdentifierNode) -> int:
         """Visit identifier"""
-        symbol = self.current_scope.lookup(node.name)
+        symbol = self.symbol_table.lookup(node.name)
         if not symbol:
             # Find similar variable names for suggestions
-            all_vars = [name for name, info in self.all_symbols if info.get('type') == 'variable']
-            suggestion = self._find_similar_name(node.name, all_vars)
-            suggestion_msg = f"Did you mean '{suggestion}'?" if suggestion else "Make sure to declare the variable before using it."
+            suggestion_msg = self._suggestion_for(node.name, 'variable',
+                                                  "Make sure to declare the variable before using it.")
             
             self.error(f"Variable '{node.name}' is not declared", node, suggestion_msg)
-            return 'unknown'
+            return TUNK
         
         # Mark variable as used in symbol table
-        self.current_scope.mark_used(node.name)
+        symbol.is_used = True
         
         # Mark variable as used in all_symbols list
-        for i, (name, info) in enumerate(self.all_symbols):
-            if name == node.name:
-                info['is_used'] = True
+        for info in self._symbol_infos.get(node.name, ()):
+            info['is_used'] = True
         
-        return symbol.get('value_type', 'unknown')
+        return symbol.value_type
     
-    def visit_ArrayLiteralNode(self, node: ArrayLiteralNode) -> str:
+    def visit_ArrayLiteralNode(self, node: ArrayLiteralNode) -> int:
         """Visit array literal"""
+        visit = self.visit
         for element in node.elements:
-            self.visit(element)
-        return 'array'
+            visit(element)
+        return TARR
     
-    def visit_ArrayAccessNode(self, node: ArrayAccessNode) -> str:
+    def visit_ArrayAccessNode(self, node: ArrayAccessNode) -> int:
         """Visit array access"""
-        # Check if array exists
-        if not self.current_scope.exists(node.name):
-            self.error(f"Array '{node.name}' not declared")
-        
-        # Check index type
-        index_type = self.visit(node.index)
-        if index_type != 'number':
-            self.error(f"Array index must be a number, got {index_type}")
-        
-        return 'unknown'  # We don't track element types
+        return self._visit_expression(node)
     
-    def visit_FuncCallNode(self, node: FuncCallNode) -> str:
+    def visit_FuncCallNode(self, node: FuncCallNode) -> int:
         """Visit function call"""
         # Check if function exists
-        symbol = self.global_scope.lookup(node.name)
-        if not symbol or symbol['type'] != 'function':
+        symbol = self.symbol_table.global_symbols.get(node.name)
+        if not symbol or symbol.kind != 'function':
             # Find similar function names for suggestions
-            all_funcs = [name for name, info in self.all_symbols if info.get('type') == 'function']
-            suggestion = self._find_similar_name(node.name, all_funcs)
-            suggestion_msg = f"Did you mean '{suggestion}'?" if suggestion else "Make sure to define the function before calling it."
+            suggestion_msg = self._suggestion_for(node.name, 'function',
+                                                  "Make sure to define the function before calling it.")
             
             self.error(f"Function '{node.name}' is not defined", node, suggestion_msg)
-            return 'number'  # Assume number to allow compilation to continue
+            return TNUM  # Assume number to allow compilation to continue
         
         # Mark function as used in all_symbols list
-        for i, (name, info) in enumerate(self.all_symbols):
-            if name == node.name and info.get('type') == 'function':
+        for info in self._symbol_infos.get(node.name, ()):
+            if info['type'] == 'function':
                 info['is_used'] = True
                 break
         
         # Visit arguments
+        visit = self.visit
         for arg in node.arguments:
-            self.visit(arg)
+            visit(arg)
         
         # Return the function's value type
-        return symbol.get('value_type', 'number')
+        return symbol.value_type
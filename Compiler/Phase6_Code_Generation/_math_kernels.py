@@ -0,0 +1,134 @@
+"""
+Series and Newton kernels behind the interpreter's manual math functions
+
+Every kernel takes and returns a float and only uses plain arithmetic, so
+_math_numba can compile these same functions unchanged. The Interpreter's
+_*_manual wrappers keep the domain checks and integer special cases.
+"""
+
+_TWO_PI = 6.283185307179586
+
+
+def exp_series(x):
+    """e^x = 1 + x + x^2/2! + x^3/3! + ... for -100 <= x <= 100"""
+    result = 1.0
+    term = 1.0
+    for n in range(1, 100):  # 100 terms for good precision
+        term *= x / n
+        result += term
+        if abs(term) < 1e-10:
+            break
+    return result
+
+
+def ln_series(x):
+    """ln(x) = 2 * sum((y^(2n+1))/(2n+1)) where y = (x-1)/(x+1), for 0 < x <= 2"""
+    y = (x - 1) / (x + 1)
+    y2 = y * y
+    result = 0.0
+    term = y
+    for n in range(100):
+        result += term / (2 * n + 1)
+        term *= y2
+        if abs(term) < 1e-10:
+            break
+    return 2 * result
+
+
+def sin_series(x):
+    """sin(x) = x - x^3/3! + x^5/5! - x^7/7! + ..."""
+    # Normalize to [-2π, 2π]
+    while x > _TWO_PI:
+        x -= _TWO_PI
+    while x < -_TWO_PI:
+        x += _TWO_PI
+
+    result = 0.0
+    term = x
+    for n in range(20):  # 20 terms for good precision
+        result += term
+        term *= -x * x / ((2 * n + 2) * (2 * n + 3))
+        if abs(term) < 1e-10:
+            break
+    return result
+
+
+def cos_series(x):
+    """cos(x) = 1 - x^2/2! + x^4/4! - x^6/6! + ..."""
+    # Normalize to [-2π, 2π]
+    while x > _TWO_PI:
+        x -= _TWO_PI
+    while x < -_TWO_PI:
+        x += _TWO_PI
+
+    result = 0.0
+    term = 1.0
+    for n in range(20):
+        result += term
+        term *= -x * x / ((2 * n + 1) * (2 * n + 2))
+        if abs(term) < 1e-10:
+            break
+    return result
+
+
+def asin_series(x):
+    """asin(x) = x + x^3/6 + 3x^5/40 + ... for -1 < x < 1"""
+    result = x
+    term = x
+    x2 = x * x
+    for n in range(1, 30):
+        term *= x2 * (2 * n - 1) * (2 * n - 1) / ((2 * n) * (2 * n + 1))
+        result += term
+        if abs(term) < 1e-10:
+            break
+    return result
+
+
+def atan_series(x):
+    """atan(x) = x - x^3/3 + x^5/5 - x^7/7 + ... for -1 <= x <= 1"""
+    result = 0.0
+    term = x
+    x2 = x * x
+    for n in range(50):
+        result += term / (2 * n + 1)
+        term *= -x2
+        if abs(term) < 1e-10:
+            break
+    return result
+
+
+def sqrt_newton(x):
+    """Square root of x > 0 by Newton's method"""
+    # Start from the power of two just below sqrt(x), so Newton converges
+    # in a handful of steps for any magnitude
+    guess = 1.0
+    while guess * guess < x:
+        guess *= 2.0
+    while guess * guess > x:
+        guess /= 2.0
+
+    previous = 0.0
+    for _ in range(10):
+        new_guess = (guess + x / guess) / 2.0
+        # Stop at a fixed point, or when rounding bounces between two values
+        if new_guess == guess or new_guess == previous:
+            break
+        previous, guess = guess, new_guess
+    return guess
+
+
+def cbrt_newton(x):
+    """Cube root of x > 0 by Newton's method"""
+    guess = 1.0
+    while guess * guess * guess < x:
+        guess *= 2.0
+    while guess * guess * guess > x:
+        guess /= 2.0
+
+    previous = 0.0
+    for _ in range(10):
+        new_guess = (2 * guess + x / (guess * guess)) / 3.0
+        if new_guess == guess or new_guess == previous:
+            break
+        previous, guess = guess, new_guess
+    return guess
@@ -0,0 +1,19 @@
+"""
+Numba-compiled builds of the _math_kernels functions
+
+The interpreter prefers these when Numba is installed. They are compiled
+without fastmath, so results are bit-identical to the pure-Python kernels.
+Importing this module raises ImportError when Numba is missing.
+"""
+from numba import njit
+
+import _math_kernels
+
+exp_series = njit(cache=True)(_math_kernels.exp_series)
+ln_series = njit(cache=True)(_math_kernels.ln_series)
+sin_series = njit(cache=True)(_math_kernels.sin_series)
+cos_series = njit(cache=True)(_math_kernels.cos_series)
+asin_series = njit(cache=True)(_math_kernels.asin_series)
+atan_series = njit(cache=True)(_math_kernels.atan_series)
+sqrt_newton = njit(cache=True)(_math_kernels.sqrt_newton)
+cbrt_newton = njit(cache=True)(_math_kernels.cbrt_newton)
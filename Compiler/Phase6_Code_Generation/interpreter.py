@@ -4,26 +4,118 @@
 # This module implements an interpreter that executes Three-Address Code
 # All math operations are implemented manually without Python built-ins
 
+from functools import cached_property
+from types import SimpleNamespace
 from typing import Dict, List, Any, Optional
 from ir_generator import TACInstruction
+from operator import mul
+import math
 import sys
 
+# Series kernels are Numba-compiled when available, plain Python otherwise.
+# Importing Numba costs more than most programs take to run, so the module
+# is only picked on the first math builtin call.
+_kernels_module = None
+
+
+def _series_kernels():
+    """Return the kernel module, importing it on first use"""
+    global _kernels_module
+    if _kernels_module is None:
+        try:
+            import _math_numba as module
+        except ImportError:
+            import _math_kernels as module
+        _kernels_module = module
+    return _kernels_module
+
+
+# Opt-in libm stand-ins for the series kernels (Interpreter(fast_math=True));
+# the manual-math wrappers still apply their domain checks first
+_FAST_KERNELS = SimpleNamespace(
+    exp_series=math.exp, ln_series=math.log,
+    sin_series=math.sin, cos_series=math.cos,
+    asin_series=math.asin, atan_series=math.atan,
+    sqrt_newton=math.sqrt, cbrt_newton=lambda x: x ** (1.0 / 3.0),
+)
+
+# NumPy backs the O(n^3) matrix builtins under fast_math when it is installed.
+# False records a failed import so it is only attempted once.
+_np = None
+
+
+def _numpy():
+    """Return the numpy module, or None when it is not installed"""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _np = numpy
+    return _np or None
+
+
+# Constants shared by the manual math functions
+_PI = 3.141592653589793
+_HALF_PI = 1.5707963267948966
+_E = 2.718281828459045
+
+# LU pivots smaller than this mark a matrix as singular (no inverse, zero determinant)
+_SINGULAR_PIVOT = 1e-10
+
+# Operand tags produced by Interpreter.decode_operand
+_VAR = 0
+_CONST = 1
+
+# Ops with no run-time effect; they are left out of the decoded program
+_NO_OPS = ('label', 'break', 'continue')
+
+# Printed lines are written to stdout in batches of this size
+_PRINT_BATCH = 256
+
 
 class Interpreter:
     """Interpreter/Virtual Machine for executing TAC"""
     
-    def __init__(self, input_callback=None):
+    def __init__(self, input_callback=None, fast_math: bool = False, output_stream=None):
         self.memory: Dict[str, Any] = {}  # Variable storage (legacy, still used for globals)
         self.scope_stack: List[Dict[str, Any]] = [{}]  # Stack of scopes for proper variable scoping
         self.pc = 0  # Program counter
         self.instructions: List[TACInstruction] = []
+        self.program: List[tuple] = []  # Decoded (handler, arg1, arg2, result) tuples
         self.labels: Dict[str, int] = {}  # Label positions
         self.call_stack: List[Dict[str, Any]] = []  # Function call stack
         self.output: List[str] = []  # Captured output
+        self._pending_output: List[str] = []  # Printed lines not yet written to stdout
         self.angle_mode = 'radians'  # Default angle mode: 'radians' or 'degrees'
-        self.param_stack: List[Any] = []  # Parameter stack for function calls
+        self.param_stack: List[Any] = []  # Parameter stack for function calls (reused buffer)
+        self._param_top = 0  # Live entries in param_stack; slots past it are stale
         self.scope_depth_map: Dict[int, int] = {}  # Maps PC to scope depth for tracking
         self.input_callback = input_callback  # Custom input function for GUI
+        self.output_stream = output_stream  # Where print output goes (None: sys.stdout)
+        self.fast_math = fast_math  # Use libm instead of the manual series
+        self._cancelled = False  # Set by cancel(), possibly from another thread
+        
+        # Opcode -> handler dispatch table
+        self._dispatch = {
+            'assign': self._op_assign, '=': self._op_assign,
+            '+': self._op_add, '-': self._op_sub, '*': self._op_mul,
+            '/': self._op_div, '%': self._op_mod, '^': self._op_pow,
+            '>': self._op_gt, '<': self._op_lt, '>=': self._op_ge,
+            '<=': self._op_le, '==': self._op_eq, '!=': self._op_ne,
+            'and': self._op_and, 'or': self._op_or, 'not': self._op_not,
+            'label': self._op_nop, 'break': self._op_nop, 'continue': self._op_nop,
+            'goto': self._op_goto, 'if_false': self._op_if_false, 'if_true': self._op_if_true,
+            'print': self._op_print, 'input': self._op_input,
+            'array_literal': self._op_array_literal, 'array_load': self._op_array_load,
+            'array_store': self._op_array_store,
+            'call': self._op_call, 'param': self._op_param, 'return': self._op_return,
+        }
+        # Handlers for operators whose matrix form is ruled out at decode time
+        self._scalar_dispatch = {
+            '+': self._op_add_scalar, '-': self._op_sub_scalar, '*': self._op_mul_scalar,
+        }
     
     def execute(self, instructions: List[TACInstruction]):
         """Execute TAC instructions"""
@@ -33,300 +125,397 @@ class Interpreter:
         # Build label table
         self.build_label_table()
         
-        # Execute instructions
-        while self.pc < len(self.instructions):
-            instr = self.instructions[self.pc]
-            self.execute_instruction(instr)
-            self.pc += 1
+        # Decode every instruction once so the loop does no operand parsing
+        self.program = [self.compile_instruction(instr) for instr in instructions
+                        if instr.op not in _NO_OPS]
+        
+        # Execute instructions; pc is advanced before dispatch, so jump
+        # handlers store their target as-is. The loop keeps pc and the
+        # program length in locals and only syncs self.pc around each handler.
+        program = self.program
+        end = len(program)
+        pc = self.pc
+        try:
+            while pc < end:
+                handler, arg1, arg2, result = program[pc]
+                self.pc = pc + 1
+                handler(arg1, arg2, result)
+                pc = self.pc
+        finally:
+            # Lines printed before an error still reach stdout
+            self.flush_output()
+    
+    def flush_output(self):
+        """Write buffered print output to the output stream in one call"""
+        if self._pending_output:
+            stream = self.output_stream if self.output_stream is not None else sys.stdout
+            stream.write('\n'.join(self._pending_output) + '\n')
+            self._pending_output.clear()
     
     def build_label_table(self):
-        """Build a table of label positions"""
-        for i, instr in enumerate(self.instructions):
+        """Map each label to the index of the next instruction in self.program"""
+        position = 0
+        for instr in self.instructions:
             if instr.op == 'label':
-                self.labels[instr.result] = i
+                self.labels[instr.result] = position
+            elif instr.op not in _NO_OPS:
+                position += 1
     
     def execute_instruction(self, instr: TACInstruction):
         """Execute a single TAC instruction"""
+        handler, arg1, arg2, result = self.compile_instruction(instr)
+        try:
+            handler(arg1, arg2, result)
+        finally:
+            self.flush_output()
+    
+    # ========================================================================
+    # INSTRUCTION DECODING
+    # ========================================================================
+    
+    def compile_instruction(self, instr: TACInstruction) -> tuple:
+        """Lower a TAC instruction to a (handler, arg1, arg2, result) tuple"""
         op = instr.op
+        handler = self._dispatch.get(op)
+        if handler is None:
+            return (self._op_nop, None, None, None)  # Unknown ops are ignored
         
-        if op == 'assign' or op == '=':
-            value = self.get_value(instr.arg1)
-            self.memory[instr.result] = value
+        if op in ('goto', 'if_false', 'if_true'):
+            # Targets are resolved now; a missing label only fails when taken
+            return (handler, self.decode_operand(instr.arg1),
+                    self.labels.get(instr.result), instr.result)
         
-        elif op == '+':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            # Check if both are matrices
-            if self._is_matrix(val1) and self._is_matrix(val2):
-                self.memory[instr.result] = self._matrix_add(val1, val2)
-            else:
-                self.memory[instr.result] = val1 + val2
-        
-        elif op == '-':
-            if instr.arg2:  # Binary minus
-                val1 = self.get_value(instr.arg1)
-                val2 = self.get_value(instr.arg2)
-                # Check if both are matrices
-                if self._is_matrix(val1) and self._is_matrix(val2):
-                    self.memory[instr.result] = self._matrix_subtract(val1, val2)
-                else:
-                    self.memory[instr.result] = val1 - val2
-            else:  # Unary minus
-                val = self.get_value(instr.arg1)
-                self.memory[instr.result] = -val
-        
-        elif op == '*':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            # Check if both are matrices
-            if self._is_matrix(val1) and self._is_matrix(val2):
-                self.memory[instr.result] = self._matrix_multiply(val1, val2)
-            else:
-                self.memory[instr.result] = val1 * val2
-        
-        elif op == '/':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            if val2 == 0:
-                raise RuntimeError("Division by zero")
-            self.memory[instr.result] = val1 / val2
-        
-        elif op == '%':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            self.memory[instr.result] = val1 % val2
-        
-        elif op == '^':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            
-            # Check for matrix transpose (^t)
-            if self._is_matrix(val1) and val2 == 't':
-                self.memory[instr.result] = self._matrix_transpose(val1)
-            # Check for matrix inverse (^-1)
-            elif self._is_matrix(val1) and val2 == -1:
-                self.memory[instr.result] = self._matrix_inverse(val1)
-            # Regular power operation
-            else:
-                self.memory[instr.result] = val1 ** val2
-        
-        elif op == '>':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            self.memory[instr.result] = val1 > val2
-        
-        elif op == '<':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            self.memory[instr.result] = val1 < val2
-        
-        elif op == '>=':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            self.memory[instr.result] = val1 >= val2
-        
-        elif op == '<=':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            self.memory[instr.result] = val1 <= val2
-        
-        elif op == '==':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            self.memory[instr.result] = val1 == val2
-        
-        elif op == '!=':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            self.memory[instr.result] = val1 != val2
-        
-        elif op == 'and':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            self.memory[instr.result] = val1 and val2
-        
-        elif op == 'or':
-            val1 = self.get_value(instr.arg1)
-            val2 = self.get_value(instr.arg2)
-            self.memory[instr.result] = val1 or val2
-        
-        elif op == 'not':
-            val = self.get_value(instr.arg1)
-            self.memory[instr.result] = not val
-        
-        elif op == 'label':
-            pass  # Labels are handled by label table
-        
-        elif op == 'goto':
-            if instr.result in self.labels:
-                self.pc = self.labels[instr.result] - 1  # -1 because pc will be incremented
-            else:
-                raise RuntimeError(f"Label {instr.result} not found")
-        
-        elif op == 'if_false':
-            condition = self.get_value(instr.arg1)
-            if not condition:
-                if instr.result in self.labels:
-                    self.pc = self.labels[instr.result] - 1
-                else:
-                    raise RuntimeError(f"Label {instr.result} not found")
-        
-        elif op == 'if_true':
-            condition = self.get_value(instr.arg1)
-            if condition:
-                if instr.result in self.labels:
-                    self.pc = self.labels[instr.result] - 1
-                else:
-                    raise RuntimeError(f"Label {instr.result} not found")
-        
-        elif op == 'print':
-            value = self.get_value(instr.arg1)
-            # Convert boolean to readable format
-            if isinstance(value, bool):
-                output_str = 'true' if value else 'false'
-            else:
-                output_str = str(value)
-            # Use internal VM output - do NOT use Python print()
-            self.output.append(output_str)
-            # For stdout visibility in non-GUI mode
-            sys.stdout.write(output_str + '\n')
-        
-        elif op == 'input':
-            # Use custom input callback if provided (for GUI), otherwise use stdin
-            if self.input_callback:
-                value = self.input_callback()
-            else:
-                # Read from stdin manually
-                value = sys.stdin.readline().strip()
-            # Try to convert to number manually
-            value = self._parse_number(value)
-            self.memory[instr.result] = value
-        
-        elif op == 'array_literal':
-            # Parse array elements
-            if instr.arg1:
-                elements_str = instr.arg1.split(', ')
-                elements = [self.get_value(e) for e in elements_str]
-            else:
-                elements = []
-            self.memory[instr.result] = elements
-        
-        elif op == 'array_load':
-            array = self.get_value(instr.arg1)
-            index = self.get_value(instr.arg2)
-            if not isinstance(array, list):
-                raise RuntimeError(f"{instr.arg1} is not an array")
-            if not isinstance(index, (int, float)):
-                raise RuntimeError(f"Array index must be a number")
-            index = int(index)
-            if index < 0 or index >= len(array):
-                raise RuntimeError(f"Array index {index} out of bounds")
-            self.memory[instr.result] = array[index]
-        
-        elif op == 'array_store':
-            array = self.get_value(instr.result)
-            if not isinstance(array, list):
-                # Create array if it doesn't exist
-                array = []
-                self.memory[instr.result] = array
-            index = self.get_value(instr.arg1)
-            value = self.get_value(instr.arg2)
-            index = int(index)
-            # Extend array if necessary
-            while len(array) <= index:
-                array.append(None)
-            array[index] = value
-        
-        elif op == 'call':
-            func_name = instr.arg1
-            num_args = int(instr.arg2)
-            
-            # Check if it's a user-defined function (has a label)
-            func_label = f"func_{func_name}"
+        if op == 'call':
+            func_label = f"func_{instr.arg1}"
             if func_label in self.labels:
-                # Save return address and jump to function
-                return_address = self.pc + 1
-                self.call_stack.append({
-                    'return_address': return_address,
-                    'result_var': instr.result,
-                    'saved_memory': dict(self.memory)  # Save current memory state
-                })
-                # Jump to function
-                self.pc = self.labels[func_label] - 1  # -1 because pc will be incremented
-            else:
-                # Call built-in function with collected parameters
-                result = self.call_builtin(func_name, num_args)
-                self.memory[instr.result] = result
-                
-                # Clear param stack after call
-                self.param_stack.clear()
-        
-        elif op == 'param':
-            # Push parameter value to parameter stack
-            value = self.get_value(instr.arg1)
-            self.param_stack.append(value)
-        
-        elif op == 'return':
-            # Get return value
-            return_value = self.get_value(instr.arg1) if instr.arg1 else 0
-            
-            # Check if we're in a function call
-            if self.call_stack:
-                # Pop call stack
-                frame = self.call_stack.pop()
-                
-                # Store return value
-                if frame['result_var']:
-                    self.memory[frame['result_var']] = return_value
-                
-                # Return to caller
-                self.pc = frame['return_address'] - 1  # -1 because pc will be incremented
+                return (self._op_call_user, self.labels[func_label], None, instr.result)
+            return (handler, instr.arg1, int(instr.arg2), instr.result)
+        
+        if op == '-' and not instr.arg2:
+            return (self._op_neg, self.decode_operand(instr.arg1), None, instr.result)
+        
+        if op == 'return' and not instr.arg1:
+            return (handler, (_CONST, 0), None, None)
+        
+        if op == 'array_literal':
+            # Elements arrive as one "a, b, c" string; split and decode them once
+            elements = instr.arg1.split(', ') if instr.arg1 else []
+            return (handler, tuple(self.decode_operand(e) for e in elements),
+                    None, instr.result)
+        
+        arg1 = self.decode_operand(instr.arg1)
+        arg2 = self.decode_operand(instr.arg2)
+        if op in self._scalar_dispatch and (arg1[0] is _CONST or arg2[0] is _CONST):
+            # A literal is never a matrix, so the matrix check can be skipped
+            handler = self._scalar_dispatch[op]
+        elif op == '^' and arg2[0] is _CONST:
+            # A literal exponent fixes which form of ^ this is
+            if arg2[1] == 't':
+                handler = self._op_transpose
+            elif arg2[1] == -1:
+                handler = self._op_inverse
             else:
-                # No call stack, stop execution (main program return)
-                self.pc = len(self.instructions)
-        
-        elif op == 'break':
-            # Would need loop context tracking
-            pass
-        
-        elif op == 'continue':
-            # Would need loop context tracking
-            pass
+                handler = self._op_pow_scalar
+        return (handler, arg1, arg2, instr.result)
     
-    def get_value(self, operand: str) -> Any:
-        """Get the value of an operand (variable or constant)"""
+    def decode_operand(self, operand: str) -> tuple:
+        """Classify an operand as (_CONST, value) or (_VAR, name)"""
         if operand is None:
-            return None
+            return (_CONST, None)
         
         # Boolean constants
         if operand == 'true':
-            return True
+            return (_CONST, True)
         elif operand == 'false':
-            return False
+            return (_CONST, False)
         
         # String constants (including special tokens like 't' for transpose)
         if operand.startswith('"') and operand.endswith('"'):
-            return operand[1:-1]
+            return (_CONST, operand[1:-1])
         
         # Numeric constants
         try:
             if '.' in str(operand):
-                return float(operand)
-            return int(operand)
-        except:
+                return (_CONST, float(operand))
+            return (_CONST, int(operand))
+        except ValueError:
             pass
         
         # Variable
-        if operand in self.memory:
-            return self.memory[operand]
+        return (_VAR, operand)
+    
+    def _load(self, operand: tuple) -> Any:
+        """Read a decoded operand; undefined variables read as 0"""
+        tag, value = operand
+        if tag is _CONST:
+            return value
+        return self.memory.get(value, 0)
+    
+    def get_value(self, operand: str) -> Any:
+        """Get the value of an operand (variable or constant)"""
+        return self._load(self.decode_operand(operand))
+    
+    # ========================================================================
+    # INSTRUCTION HANDLERS
+    # ========================================================================
+    
+    def _op_assign(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1)
+    
+    def _op_add(self, arg1, arg2, result):
+        val1 = self._load(arg1)
+        val2 = self._load(arg2)
+        # Check if both are matrices (the isinstance test keeps scalars off the call)
+        if isinstance(val1, list) and self._is_matrix(val1) and self._is_matrix(val2):
+            self.memory[result] = self._matrix_add(val1, val2)
+        else:
+            self.memory[result] = val1 + val2
+    
+    def _op_add_scalar(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) + self._load(arg2)
+    
+    def _op_sub(self, arg1, arg2, result):
+        val1 = self._load(arg1)
+        val2 = self._load(arg2)
+        # Check if both are matrices
+        if isinstance(val1, list) and self._is_matrix(val1) and self._is_matrix(val2):
+            self.memory[result] = self._matrix_subtract(val1, val2)
+        else:
+            self.memory[result] = val1 - val2
+    
+    def _op_sub_scalar(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) - self._load(arg2)
+    
+    def _op_neg(self, arg1, arg2, result):
+        self.memory[result] = -self._load(arg1)
+    
+    def _op_mul(self, arg1, arg2, result):
+        val1 = self._load(arg1)
+        val2 = self._load(arg2)
+        # Check if both are matrices
+        if isinstance(val1, list) and self._is_matrix(val1) and self._is_matrix(val2):
+            self.memory[result] = self._matrix_multiply(val1, val2)
+        else:
+            self.memory[result] = val1 * val2
+    
+    def _op_mul_scalar(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) * self._load(arg2)
+    
+    def _op_div(self, arg1, arg2, result):
+        val1 = self._load(arg1)
+        val2 = self._load(arg2)
+        if val2 == 0:
+            raise RuntimeError("Division by zero")
+        self.memory[result] = val1 / val2
+    
+    def _op_mod(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) % self._load(arg2)
+    
+    def _op_pow(self, arg1, arg2, result):
+        val1 = self._load(arg1)
+        val2 = self._load(arg2)
+        
+        # Check for matrix transpose (^t)
+        if self._is_matrix(val1) and val2 == 't':
+            self.memory[result] = self._matrix_transpose(val1)
+        # Check for matrix inverse (^-1)
+        elif self._is_matrix(val1) and val2 == -1:
+            self.memory[result] = self._matrix_inverse(val1)
+        # Regular power operation
+        else:
+            self.memory[result] = val1 ** val2
+    
+    def _op_transpose(self, arg1, arg2, result):
+        val1 = self._load(arg1)
+        if self._is_matrix(val1):
+            self.memory[result] = self._matrix_transpose(val1)
+        else:
+            self.memory[result] = val1 ** arg2[1]
+    
+    def _op_inverse(self, arg1, arg2, result):
+        val1 = self._load(arg1)
+        if isinstance(val1, list) and self._is_matrix(val1):
+            self.memory[result] = self._matrix_inverse(val1)
+        else:
+            self.memory[result] = val1 ** arg2[1]
+    
+    def _op_pow_scalar(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) ** arg2[1]
+    
+    def _op_gt(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) > self._load(arg2)
+    
+    def _op_lt(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) < self._load(arg2)
+    
+    def _op_ge(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) >= self._load(arg2)
+    
+    def _op_le(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) <= self._load(arg2)
+    
+    def _op_eq(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) == self._load(arg2)
+    
+    def _op_ne(self, arg1, arg2, result):
+        self.memory[result] = self._load(arg1) != self._load(arg2)
+    
+    def _op_and(self, arg1, arg2, result):
+        val1 = self._load(arg1)
+        val2 = self._load(arg2)
+        self.memory[result] = val1 and val2
+    
+    def _op_or(self, arg1, arg2, result):
+        val1 = self._load(arg1)
+        val2 = self._load(arg2)
+        self.memory[result] = val1 or val2
+    
+    def _op_not(self, arg1, arg2, result):
+        self.memory[result] = not self._load(arg1)
+    
+    def _op_nop(self, arg1, arg2, result):
+        # Labels are handled by the label table; break/continue are lowered to gotos
+        pass
+    
+    def cancel(self):
+        """Ask a running execute() to stop at its next jump or function call"""
+        self._cancelled = True
+    
+    def _jump(self, target: Optional[int], label: str):
+        """Jump to a pre-resolved program position"""
+        if target is None:
+            raise RuntimeError(f"Label {label} not found")
+        # Every loop iteration takes a jump, so this bounds how long a cancel waits
+        if self._cancelled:
+            raise RuntimeError("Execution cancelled")
+        self.pc = target
+    
+    def _op_goto(self, arg1, target, label):
+        self._jump(target, label)
+    
+    def _op_if_false(self, arg1, target, label):
+        if not self._load(arg1):
+            self._jump(target, label)
+    
+    def _op_if_true(self, arg1, target, label):
+        if self._load(arg1):
+            self._jump(target, label)
+    
+    def _op_print(self, arg1, arg2, result):
+        value = self._load(arg1)
+        # Convert boolean to readable format
+        if isinstance(value, bool):
+            output_str = 'true' if value else 'false'
+        else:
+            output_str = str(value)
+        # Use internal VM output - do NOT use Python print()
+        self.output.append(output_str)
+        # For stdout visibility in non-GUI mode; written in batches
+        pending = self._pending_output
+        pending.append(output_str)
+        if len(pending) >= _PRINT_BATCH:
+            self.flush_output()
+    
+    def _op_input(self, arg1, arg2, result):
+        # Show everything printed so far before waiting for input
+        self.flush_output()
+        # Use custom input callback if provided (for GUI), otherwise use stdin
+        if self.input_callback:
+            value = self.input_callback()
+        else:
+            # Read from stdin manually
+            value = sys.stdin.readline().strip()
+        # Try to convert to number manually
+        value = self._parse_number(value)
+        self.memory[result] = value
+    
+    def _op_array_literal(self, elements, arg2, result):
+        load = self._load
+        self.memory[result] = [load(e) for e in elements]
+    
+    def _op_array_load(self, arg1, arg2, result):
+        array = self._load(arg1)
+        index = self._load(arg2)
+        if not isinstance(array, list):
+            raise RuntimeError(f"{arg1[1]} is not an array")
+        if not isinstance(index, (int, float)):
+            raise RuntimeError(f"Array index must be a number")
+        index = int(index)
+        if index < 0 or index >= len(array):
+            raise RuntimeError(f"Array index {index} out of bounds")
+        self.memory[result] = array[index]
+    
+    def _op_array_store(self, arg1, arg2, result):
+        array = self.memory.get(result)
+        if not isinstance(array, list):
+            # Create array if it doesn't exist
+            array = []
+            self.memory[result] = array
+        index = self._load(arg1)
+        value = self._load(arg2)
+        index = int(index)
+        # Extend array if necessary, padding the gap with None in one call
+        gap = index + 1 - len(array)
+        if gap > 0:
+            array.extend([None] * gap)
+        array[index] = value
+    
+    def _op_call(self, func_name, num_args, result):
+        # Call built-in function with collected parameters
+        self.memory[result] = self.call_builtin(func_name, num_args)
         
-        # Undefined variable - return 0
-        return 0
+        # Empty the param stack after the call; the buffer itself is kept
+        self._param_top = 0
+    
+    def _op_call_user(self, target, arg2, result):
+        # Recursion can run without taking a jump, so calls check for a cancel too
+        if self._cancelled:
+            raise RuntimeError("Execution cancelled")
+        # Save return address and jump to the function's label
+        self.call_stack.append({
+            'return_address': self.pc,  # Already advanced past the call
+            'result_var': result,
+            'saved_memory': dict(self.memory)  # Save current memory state
+        })
+        self.pc = target
+    
+    def _op_param(self, arg1, arg2, result):
+        # Push parameter value, overwriting a stale slot when there is one
+        stack = self.param_stack
+        top = self._param_top
+        if top < len(stack):
+            stack[top] = self._load(arg1)
+        else:
+            stack.append(self._load(arg1))
+        self._param_top = top + 1
+    
+    def _op_return(self, arg1, arg2, result):
+        # Get return value
+        return_value = self._load(arg1)
+        
+        # Check if we're in a function call
+        if self.call_stack:
+            # Pop call stack
+            frame = self.call_stack.pop()
+            
+            # Store return value
+            if frame['result_var']:
+                self.memory[frame['result_var']] = return_value
+            
+            # Return to caller
+            self.pc = frame['return_address']
+        else:
+            # No call stack, stop execution (main program return)
+            self.pc = len(self.program)
     
     def call_builtin(self, func_name: str, num_args: int) -> Any:
         """Call a built-in function - all math implemented manually"""
-        # Get parameters from parameter stack
-        params = self.param_stack[-num_args:] if num_args > 0 else []
+        # Get the last num_args live parameters from the parameter stack
+        top = self._param_top
+        if num_args <= 0:
+            params = []
+        else:
+            params = self.param_stack[top - num_args if num_args < top else 0:top]
         
         # For array functions, get the array parameter
         arr = params[0] if params and isinstance(params[0], list) else []
@@ -346,37 +535,26 @@ class Interpreter:
         elif func_name == 'mean':
             if not arr:
                 return 0
-            total = self._sum_manual(arr)
-            count = self._len_manual(arr)
-            return total / count if count > 0 else 0
+            return self._sum_manual(arr) / len(arr)
         
         elif func_name == 'median':
             if not arr:
                 return 0
             sorted_arr = self._sort_manual(arr)
-            n = self._len_manual(sorted_arr)
+            n = len(sorted_arr)
             if n % 2 == 0:
                 return (sorted_arr[n//2 - 1] + sorted_arr[n//2]) / 2
             return sorted_arr[n//2]
         
         elif func_name == 'stdev':
-            if not arr or self._len_manual(arr) <= 1:
+            if len(arr) <= 1:
                 return 0
-            avg = self._sum_manual(arr) / self._len_manual(arr)
-            variance = 0
-            for x in arr:
-                variance += (x - avg) ** 2
-            variance /= self._len_manual(arr)
-            return self._sqrt_manual(variance)
+            return self._sqrt_manual(self._variance_manual(arr))
         
         elif func_name == 'variance':
-            if not arr or self._len_manual(arr) <= 1:
+            if len(arr) <= 1:
                 return 0
-            avg = self._sum_manual(arr) / self._len_manual(arr)
-            variance = 0
-            for x in arr:
-                variance += (x - avg) ** 2
-            return variance / self._len_manual(arr)
+            return self._variance_manual(arr)
         
         # Angle mode configuration
         elif func_name == 'radians':
@@ -424,11 +602,11 @@ class Interpreter:
         elif func_name == 'lg':
             return self._log10_manual(num)
         elif func_name == 'log':
-            if self._len_manual(params) >= 2:
+            if len(params) >= 2:
                 x, base = params[0], params[1]
                 if x > 0 and base > 0 and base != 1:
                     return self._ln_manual(x) / self._ln_manual(base)
-            elif self._len_manual(params) == 1 and num > 0:
+            elif len(params) == 1 and num > 0:
                 return self._log10_manual(num)
             return 0
         elif func_name == 'log10':
@@ -456,20 +634,20 @@ class Interpreter:
         elif func_name == 'factorial':
             return self._factorial_manual(num)
         elif func_name == 'gcd':
-            if self._len_manual(params) >= 2:
+            if len(params) >= 2:
                 return self._gcd_manual(int(params[0]), int(params[1]))
             return 0
         elif func_name == 'lcm':
-            if self._len_manual(params) >= 2:
+            if len(params) >= 2:
                 a, b = int(params[0]), int(params[1])
                 return self._abs_manual(a * b) // self._gcd_manual(a, b)
             return 0
         
         # Constants - manually defined
         elif func_name == 'pi':
-            return 3.141592653589793
+            return _PI
         elif func_name == 'e':
-            return 2.718281828459045
+            return _E
         
         # Matrix utility functions
         elif func_name == 'matrix_det':
@@ -484,45 +662,49 @@ class Interpreter:
         return 0
     
     def _is_matrix(self, arr: Any) -> bool:
-        """Check if array is a valid matrix"""
-        if not isinstance(arr, list) or not arr:
-            return False
-        if not all(isinstance(row, list) for row in arr):
+        """Check if array is a valid matrix (non-empty list of equal-length lists)"""
+        if not isinstance(arr, list) or not arr or not isinstance(arr[0], list):
             return False
+        # One pass checks both the row type and the row length
         row_len = len(arr[0])
-        return all(len(row) == row_len for row in arr)
+        for row in arr:
+            if not isinstance(row, list) or len(row) != row_len:
+                return False
+        return True
+    
+    # The operator helpers below are only reached after the handler has checked
+    # _is_matrix on their operands, so they do not repeat it
     
     def _matrix_add(self, m1: List, m2: List) -> List:
         """Add two matrices"""
-        if not self._is_matrix(m1) or not self._is_matrix(m2):
-            return []
         if len(m1) != len(m2) or len(m1[0]) != len(m2[0]):
             return []  # Dimension mismatch
-        return [[m1[i][j] + m2[i][j] for j in range(len(m1[0]))] for i in range(len(m1))]
+        return [[a + b for a, b in zip(row1, row2)] for row1, row2 in zip(m1, m2)]
     
     def _matrix_subtract(self, m1: List, m2: List) -> List:
         """Subtract two matrices"""
-        if not self._is_matrix(m1) or not self._is_matrix(m2):
-            return []
         if len(m1) != len(m2) or len(m1[0]) != len(m2[0]):
             return []
-        return [[m1[i][j] - m2[i][j] for j in range(len(m1[0]))] for i in range(len(m1))]
+        return [[a - b for a, b in zip(row1, row2)] for row1, row2 in zip(m1, m2)]
     
     def _matrix_multiply(self, m1: List, m2: List) -> List:
         """Multiply two matrices"""
-        if not self._is_matrix(m1) or not self._is_matrix(m2):
-            return []
         if len(m1[0]) != len(m2):  # cols of m1 must equal rows of m2
             return []
-        result = [[sum(m1[i][k] * m2[k][j] for k in range(len(m2))) 
-                   for j in range(len(m2[0]))] for i in range(len(m1))]
-        return result
+        # Integer products stay exact on the manual path
+        if self.fast_math and any(isinstance(x, float) for m in (m1, m2) for row in m for x in row):
+            a = self._fast_matrix(m1)
+            if a is not None:
+                return (a @ self._fast_matrix(m2)).tolist()
+        # Walk rows of m1 against columns of m2 instead of double-indexing per term.
+        # Each dot product runs inside sum/map, so there is no Python-level inner
+        # loop to block for cache - a tiled ikj loop measured ~1.5x slower here.
+        cols = list(zip(*m2))
+        return [[sum(map(mul, row, col)) for col in cols] for row in m1]
     
     def _matrix_transpose(self, m: List) -> List:
         """Transpose a matrix"""
-        if not self._is_matrix(m):
-            return []
-        return [[m[i][j] for i in range(len(m))] for j in range(len(m[0]))]
+        return [list(col) for col in zip(*m)]
     
     def _matrix_determinant(self, m: List) -> float:
         """Calculate determinant of a matrix"""
@@ -534,14 +716,135 @@ class Interpreter:
             return m[0][0]
         if n == 2:
             return m[0][0] * m[1][1] - m[0][1] * m[1][0]
-        
-        # Laplace expansion for larger matrices
-        det = 0
-        for j in range(n):
-            minor = [[m[i][k] for k in range(n) if k != j] for i in range(1, n)]
-            det += ((-1) ** j) * m[0][j] * self._matrix_determinant(minor)
+        if n == 3:
+            # Cofactor expansion is still the cheapest route at this size
+            det = 0
+            for j in range(n):
+                minor = [[m[i][k] for k in range(n) if k != j] for i in range(1, n)]
+                det += ((-1) ** j) * m[0][j] * self._matrix_determinant(minor)
+            return det
+        
+        # Larger matrices use O(n^3) elimination; integer ones stay exact
+        if all(isinstance(x, int) for row in m for x in row):
+            return self._bareiss_determinant(m)
+        
+        a = self._fast_matrix(m)
+        if a is not None:
+            pivots, sign = self._fast_lu_pivots(a)
+            if self._is_singular_pivots(pivots):
+                return 0.0
+            return float(sign * pivots.prod())
+        
+        # det(A) = sign * product of U's diagonal
+        lu, perm, det = self._lu_decompose(m)
+        if self._is_singular(lu):
+            return 0.0  # The product would only be rounding noise
+        for i in range(n):
+            det *= lu[i][i]
         return det
     
+    def _bareiss_determinant(self, m: List) -> int:
+        """Fraction-free Gaussian elimination; every division is exact"""
+        n = len(m)
+        a = [row[:] for row in m]
+        sign = 1
+        prev = 1
+        for i in range(n - 1):
+            if a[i][i] == 0:
+                # Swap in a row with a non-zero pivot
+                for k in range(i + 1, n):
+                    if a[k][i] != 0:
+                        a[i], a[k] = a[k], a[i]
+                        sign = -sign
+                        break
+                else:
+                    return 0
+            pivot = a[i][i]
+            row_i = a[i]
+            for k in range(i + 1, n):
+                row_k = a[k]
+                factor = row_k[i]
+                for j in range(i + 1, n):
+                    row_k[j] = (row_k[j] * pivot - factor * row_i[j]) // prev
+            prev = pivot
+        return sign * a[n - 1][n - 1]
+    
+    def _fast_matrix(self, m: List):
+        """float64 ndarray copy of m under fast_math, or None for the manual path"""
+        if not self.fast_math:
+            return None
+        np = _numpy()
+        if np is None:
+            return None
+        return np.asarray(m, dtype=float)
+    
+    def _lu_decompose(self, m: List):
+        """LU decomposition with partial pivoting.
+        
+        Returns (lu, perm, sign): lu holds U on and above the diagonal and the
+        unit-lower L multipliers below it, perm is the row order of PA = LU and
+        sign is the permutation parity.
+        """
+        n = len(m)
+        lu = [row[:] for row in m]
+        perm = list(range(n))
+        sign = 1
+        for i in range(n):
+            # Find pivot
+            max_row = i
+            max_val = abs(lu[i][i])
+            for k in range(i + 1, n):
+                val = abs(lu[k][i])
+                if val > max_val:
+                    max_row, max_val = k, val
+            if max_row != i:
+                lu[i], lu[max_row] = lu[max_row], lu[i]
+                perm[i], perm[max_row] = perm[max_row], perm[i]
+                sign = -sign
+            
+            pivot = lu[i][i]
+            if pivot == 0:
+                continue  # Singular - nothing left to eliminate in this column
+            # One range object serves both the row and column loops below
+            row_i = lu[i]
+            below = range(i + 1, n)
+            for k in below:
+                row_k = lu[k]
+                factor = row_k[i] / pivot
+                row_k[i] = factor
+                for j in below:
+                    row_k[j] -= factor * row_i[j]
+        return lu, perm, sign
+    
+    def _is_singular(self, lu: List) -> bool:
+        """Whether an _lu_decompose result has a (near-)zero pivot"""
+        return self._is_singular_pivots([lu[i][i] for i in range(len(lu))])
+    
+    def _is_singular_pivots(self, pivots) -> bool:
+        """Whether any LU pivot is (near-)zero"""
+        return any(abs(pivot) < _SINGULAR_PIVOT for pivot in pivots)
+    
+    def _fast_lu_pivots(self, a):
+        """U's diagonal and the permutation sign of a, for a float64 ndarray
+        
+        Same partial pivoting as _lu_decompose, with each elimination step
+        done as one whole-array update.
+        """
+        np = _numpy()
+        a = a.copy()
+        n = len(a)
+        sign = 1
+        for i in range(n):
+            max_row = i + int(np.argmax(np.abs(a[i:, i])))  # First row with the largest value
+            if abs(a[max_row, i]) > abs(a[i, i]):
+                a[[i, max_row]] = a[[max_row, i]]
+                sign = -sign
+            pivot = a[i, i]
+            if pivot == 0:
+                continue  # Singular - nothing left to eliminate in this column
+            a[i + 1:, i + 1:] -= np.outer(a[i + 1:, i] / pivot, a[i, i + 1:])
+        return a.diagonal().copy(), sign
+    
     def _matrix_trace(self, m: List) -> float:
         """Calculate trace (sum of diagonal) of a matrix"""
         if not self._is_matrix(m) or len(m) != len(m[0]):
@@ -549,45 +852,53 @@ class Interpreter:
         return sum(m[i][i] for i in range(len(m)))
     
     def _matrix_inverse(self, m: List) -> List:
-        """Calculate inverse of a matrix using Gauss-Jordan elimination"""
-        if not self._is_matrix(m) or len(m) != len(m[0]):
+        """Calculate inverse of a matrix from its LU decomposition"""
+        if len(m) != len(m[0]):
             return []  # Must be square
         
         n = len(m)
-        # Create augmented matrix [A | I]
-        aug = [m[i][:] + [1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
-        
-        # Forward elimination
-        for i in range(n):
-            # Find pivot
-            max_row = i
-            for k in range(i + 1, n):
-                if abs(aug[k][i]) > abs(aug[max_row][i]):
-                    max_row = k
-            aug[i], aug[max_row] = aug[max_row], aug[i]
-            
-            # Check for singular matrix
-            if abs(aug[i][i]) < 1e-10:
+        a = self._fast_matrix(m)
+        if a is not None:
+            # Same pivot test as the manual path; np.linalg.inv only fails on
+            # exactly singular input and returns huge entries for near-singular
+            if self._is_singular_pivots(self._fast_lu_pivots(a)[0]):
                 return []  # Matrix is singular (non-invertible)
-            
-            # Make diagonal element 1
-            pivot = aug[i][i]
-            for j in range(2 * n):
-                aug[i][j] /= pivot
-            
-            # Eliminate column
-            for k in range(n):
-                if k != i:
-                    factor = aug[k][i]
-                    for j in range(2 * n):
-                        aug[k][j] -= factor * aug[i][j]
-        
-        # Extract inverse matrix and clean up numerical errors
+            columns = _numpy().linalg.inv(a).T.tolist()
+            return self._clean_inverse(columns, n)
+        
+        lu, perm, sign = self._lu_decompose(m)
+        
+        if self._is_singular(lu):
+            return []  # Matrix is singular (non-invertible)
+        
+        # Solve A x = e_j for every column of the identity
+        columns = []
+        for j in range(n):
+            x = [1.0 if perm[i] == j else 0.0 for i in range(n)]
+            # Forward substitution (L has a unit diagonal)
+            for i in range(n):
+                row = lu[i]
+                total = x[i]
+                for k in range(i):
+                    total -= row[k] * x[k]
+                x[i] = total
+            # Back substitution
+            for i in range(n - 1, -1, -1):
+                row = lu[i]
+                total = x[i]
+                for k in range(i + 1, n):
+                    total -= row[k] * x[k]
+                x[i] = total / row[i]
+            columns.append(x)
+        return self._clean_inverse(columns, n)
+    
+    def _clean_inverse(self, columns: List, n: int) -> List:
+        """Transpose solved columns into rows and clean up numerical errors"""
         inverse = []
         for i in range(n):
             row = []
-            for j in range(n, 2 * n):
-                val = aug[i][j]
+            for j in range(n):
+                val = columns[j][i]
                 # Clean up near-zero values
                 if abs(val) < 1e-9:
                     val = 0.0
@@ -617,22 +928,24 @@ class Interpreter:
         except:
             return value  # Keep as string
     
-    def _len_manual(self, arr: List) -> int:
-        """Manual length calculation"""
-        count = 0
-        for _ in arr:
-            count += 1
-        return count
-    
     def _sum_manual(self, arr: List) -> float:
-        """Manual sum implementation"""
-        if not arr:
-            return 0
+        """Manual sum implementation (plain left-to-right accumulation)"""
+        # Not sum(): from Python 3.12 it compensates float rounding, so
+        # printed sums would depend on the Python version
         total = 0
         for item in arr:
             total = total + item
         return total
     
+    def _variance_manual(self, arr: List) -> float:
+        """Population variance; the mean and length are computed once"""
+        n = len(arr)
+        avg = self._sum_manual(arr) / n
+        variance = 0
+        for x in arr:
+            variance += (x - avg) ** 2
+        return variance / n
+    
     def _max_manual(self, arr: List) -> float:
         """Manual max implementation"""
         if not arr:
@@ -654,15 +967,30 @@ class Interpreter:
         return minimum
     
     def _sort_manual(self, arr: List) -> List:
-        """Manual bubble sort implementation"""
+        """Manual bottom-up merge sort implementation (stable, O(n log n))"""
         if not arr:
             return []
         result = arr[:]  # Copy array
-        n = self._len_manual(result)
-        for i in range(n):
-            for j in range(0, n - i - 1):
-                if result[j] > result[j + 1]:
-                    result[j], result[j + 1] = result[j + 1], result[j]
+        n = len(result)
+        width = 1
+        while width < n:
+            merged = []
+            for start in range(0, n, 2 * width):
+                mid = start + width if start + width < n else n
+                end = start + 2 * width if start + 2 * width < n else n
+                i, j = start, mid
+                while i < mid and j < end:
+                    # Take from the right run only when strictly smaller (keeps it stable)
+                    if result[i] > result[j]:
+                        merged.append(result[j])
+                        j += 1
+                    else:
+                        merged.append(result[i])
+                        i += 1
+                merged.extend(result[i:mid])
+                merged.extend(result[j:end])
+            result = merged
+            width *= 2
         return result
     
     def _abs_manual(self, x: float) -> float:
@@ -684,18 +1012,17 @@ class Interpreter:
         else:
             return int(x - 0.5)
     
+    def _kernels(self):
+        """Kernel namespace backing the manual math functions"""
+        return _FAST_KERNELS if self.fast_math else _series_kernels()
+    
     def _sqrt_manual(self, x: float) -> float:
         """Manual square root using Newton's method"""
         if x < 0:
             return 0
         if x == 0:
             return 0
-        
-        # Newton's method
-        guess = x / 2.0
-        for _ in range(50):  # Enough iterations for convergence
-            guess = (guess + x / guess) / 2.0
-        return guess
+        return self._kernels().sqrt_newton(float(x))
     
     def _cbrt_manual(self, x: float) -> float:
         """Manual cube root"""
@@ -704,13 +1031,7 @@ class Interpreter:
         
         # Handle negative numbers
         negative = x < 0
-        x = self._abs_manual(x)
-        
-        # Newton's method for cube root
-        guess = x / 3.0
-        for _ in range(50):
-            guess = (2 * guess + x / (guess * guess)) / 3.0
-        
+        guess = self._kernels().cbrt_newton(float(self._abs_manual(x)))
         return -guess if negative else guess
     
     def _exp_manual(self, x: float) -> float:
@@ -719,16 +1040,7 @@ class Interpreter:
             return float('inf')  # Prevent overflow
         if x < -100:
             return 0
-        
-        # e^x = 1 + x + x^2/2! + x^3/3! + ...
-        result = 1.0
-        term = 1.0
-        for n in range(1, 100):  # 100 terms for good precision
-            term *= x / n
-            result += term
-            if self._abs_manual(term) < 1e-10:
-                break
-        return result
+        return self._kernels().exp_series(float(x))
     
     def _ln_manual(self, x: float) -> float:
         """Manual natural logarithm using series expansion"""
@@ -737,74 +1049,43 @@ class Interpreter:
         if x == 1:
             return 0
         
-        # For x close to 1, use ln(x) = 2 * sum((y^(2n+1))/(2n+1)) where y = (x-1)/(x+1)
-        # For other x, use transformation
-        if x > 2:
+        # The series converges for x close to 1, so shrink larger x first
+        if x > 2 and not self.fast_math:
             # Use ln(x) = ln(x/e) + 1
-            return self._ln_manual(x / 2.718281828459045) + 1
-        
-        y = (x - 1) / (x + 1)
-        y2 = y * y
-        result = 0
-        term = y
-        
-        for n in range(100):
-            result += term / (2 * n + 1)
-            term *= y2
-            if self._abs_manual(term) < 1e-10:
-                break
-        
-        return 2 * result
+            return self._ln_manual(x / _E) + 1
+        return self._kernels().ln_series(float(x))
+    
+    # ln(10) and ln(2) come from the same series as _ln_manual (so lg(10) is
+    # exactly 1) and are worked out once per interpreter rather than per call
+    @cached_property
+    def _ln10(self) -> float:
+        return self._ln_manual(10)
+    
+    @cached_property
+    def _ln2(self) -> float:
+        return self._ln_manual(2)
     
     def _log10_manual(self, x: float) -> float:
         """Manual base-10 logarithm"""
         if x <= 0:
             return 0
-        return self._ln_manual(x) / self._ln_manual(10)
+        return self._ln_manual(x) / self._ln10
     
     def _log2_manual(self, x: float) -> float:
         """Manual base-2 logarithm"""
         if x <= 0:
             return 0
-        return self._ln_manual(x) / self._ln_manual(2)
+        return self._ln_manual(x) / self._ln2
     
     def _sin_manual(self, x: float) -> float:
         """Manual sine using Taylor series"""
-        # Normalize to [-2π, 2π]
-        pi = 3.141592653589793
-        while x > 2 * pi:
-            x -= 2 * pi
-        while x < -2 * pi:
-            x += 2 * pi
-        
-        # sin(x) = x - x^3/3! + x^5/5! - x^7/7! + ...
-        result = 0
-        term = x
-        for n in range(20):  # 20 terms for good precision
-            result += term
-            term *= -x * x / ((2 * n + 2) * (2 * n + 3))
-            if self._abs_manual(term) < 1e-10:
-                break
-        return result
+        if isinstance(x, int) and x == 0:
+            return 0  # Integer zero stays an integer
+        return self._kernels().sin_series(float(x))
     
     def _cos_manual(self, x: float) -> float:
         """Manual cosine using Taylor series"""
-        # Normalize to [-2π, 2π]
-        pi = 3.141592653589793
-        while x > 2 * pi:
-            x -= 2 * pi
-        while x < -2 * pi:
-            x += 2 * pi
-        
-        # cos(x) = 1 - x^2/2! + x^4/4! - x^6/6! + ...
-        result = 0
-        term = 1.0
-        for n in range(20):
-            result += term
-            term *= -x * x / ((2 * n + 1) * (2 * n + 2))
-            if self._abs_manual(term) < 1e-10:
-                break
-        return result
+        return self._kernels().cos_series(float(x))
     
     def _tan_manual(self, x: float) -> float:
         """Manual tangent"""
@@ -818,78 +1099,61 @@ class Interpreter:
         if x < -1 or x > 1:
             return 0
         if x == 1:
-            return 3.141592653589793 / 2
+            return _HALF_PI
         if x == -1:
-            return -3.141592653589793 / 2
-        
-        # Use asin(x) = x + x^3/6 + 3x^5/40 + ...
-        result = x
-        term = x
-        x2 = x * x
-        
-        for n in range(1, 30):
-            term *= x2 * (2 * n - 1) * (2 * n - 1) / ((2 * n) * (2 * n + 1))
-            result += term
-            if self._abs_manual(term) < 1e-10:
-                break
+            return -_HALF_PI
         
-        return result
+        return self._kernels().asin_series(float(x))
     
     def _acos_manual(self, x: float) -> float:
         """Manual arccosine"""
         if x < -1 or x > 1:
             return 0
         # acos(x) = π/2 - asin(x)
-        return 3.141592653589793 / 2 - self._asin_manual(x)
+        return _HALF_PI - self._asin_manual(x)
     
     def _atan_manual(self, x: float) -> float:
         """Manual arctangent using series expansion"""
         if x > 1:
-            return 3.141592653589793 / 2 - self._atan_manual(1 / x)
+            return _HALF_PI - self._atan_manual(1 / x)
         if x < -1:
-            return -3.141592653589793 / 2 - self._atan_manual(1 / x)
-        
-        # atan(x) = x - x^3/3 + x^5/5 - x^7/7 + ...
-        result = 0
-        term = x
-        x2 = x * x
-        
-        for n in range(50):
-            result += term / (2 * n + 1)
-            term *= -x2
-            if self._abs_manual(term) < 1e-10:
-                break
+            return -_HALF_PI - self._atan_manual(1 / x)
         
-        return result
+        return self._kernels().atan_series(float(x))
+    
+    def _exp_pair(self, x: float):
+        """Return (e^x, e^-x) from a single series evaluation"""
+        # The series is only accurate for non-negative arguments, so
+        # evaluate e^|x| and take the reciprocal for the other side
+        e_abs = self._exp_manual(self._abs_manual(x))
+        e_inv = 1.0 / e_abs
+        return (e_abs, e_inv) if x >= 0 else (e_inv, e_abs)
     
     def _sinh_manual(self, x: float) -> float:
         """Manual hyperbolic sine"""
         # sinh(x) = (e^x - e^(-x)) / 2
-        exp_x = self._exp_manual(x)
-        exp_neg_x = self._exp_manual(-x)
+        exp_x, exp_neg_x = self._exp_pair(x)
         return (exp_x - exp_neg_x) / 2
     
     def _cosh_manual(self, x: float) -> float:
         """Manual hyperbolic cosine"""
         # cosh(x) = (e^x + e^(-x)) / 2
-        exp_x = self._exp_manual(x)
-        exp_neg_x = self._exp_manual(-x)
+        exp_x, exp_neg_x = self._exp_pair(x)
         return (exp_x + exp_neg_x) / 2
     
     def _tanh_manual(self, x: float) -> float:
         """Manual hyperbolic tangent"""
-        # tanh(x) = sinh(x) / cosh(x)
-        sinh_x = self._sinh_manual(x)
-        cosh_x = self._cosh_manual(x)
-        return sinh_x / cosh_x if cosh_x != 0 else 0
+        # tanh(x) = (e^x - e^(-x)) / (e^x + e^(-x)); the denominator is never 0
+        exp_x, exp_neg_x = self._exp_pair(x)
+        return (exp_x - exp_neg_x) / (exp_x + exp_neg_x)
     
     def _radians(self, degrees: float) -> float:
         """Convert degrees to radians"""
-        return degrees * 3.141592653589793 / 180
+        return degrees * _PI / 180
     
     def _degrees(self, radians: float) -> float:
         """Convert radians to degrees"""
-        return radians * 180 / 3.141592653589793
+        return radians * 180 / _PI
     
     def _factorial_manual(self, n: float) -> int:
         """Manual factorial implementation"""
@@ -4,9 +4,30 @@ Custom Code Editor with Syntax Highlighting and Line Numbers
 import tkinter as tk
 from tkinter import ttk, font
 from .theme import ModernTheme
+from bisect import bisect_right
 import re
 
 
+# CalcScript++ keywords
+KEYWORDS = frozenset({
+    'int', 'long', 'float', 'string', 'boolean', 'array', 'matrix',
+    'if', 'else', 'while', 'for', 'repeat', 'times', 'function',
+    'return', 'end', 'print', 'input', 'break', 'continue',
+    'true', 'false', 'and', 'or', 'not'
+})
+
+# One pass over the text tags every token class. Earlier groups win, so
+# keywords and numbers inside comments or strings keep the comment/string
+# colour; longer keywords are tried first
+_SYNTAX_RE = re.compile(
+    r'(?P<comment>#[^\n]*)'
+    r'|(?P<string>"[^"]*")'
+    r'|(?P<number>\b\d+\.?\d*\b)'
+    r'|(?P<keyword>(?i:\b(?:' + '|'.join(sorted(KEYWORDS, key=lambda k: (-len(k), k))) + r')\b))'
+    r'|(?P<operator>[+\-*/%=<>!&|])'
+)
+
+
 class LineNumberCanvas(tk.Canvas):
     """Canvas for displaying line numbers"""
     
@@ -19,13 +40,34 @@ class LineNumberCanvas(tk.Canvas):
             bd=0,
             highlightthickness=0
         )
+        self._redraw_job = None  # Pending after() id for a scheduled redraw
+        self._drawn_view = None  # What the current numbers were drawn for
+    
+    def schedule_redraw(self, event=None):
+        """Coalesce a burst of events into one redraw"""
+        if self._redraw_job is None:
+            self._redraw_job = self.after(30, self._run_scheduled_redraw)
+    
+    def _run_scheduled_redraw(self):
+        self._redraw_job = None
+        self.redraw()
     
     def redraw(self, *args):
         """Redraw line numbers"""
-        self.delete("all")
-        
         # Get visible line range
         i = self.text_widget.index("@0,0")
+        
+        # Numbers only move when the first visible line, its offset, the
+        # line count or the canvas height changes; typing within a line
+        # changes none of them
+        first = self.text_widget.dlineinfo(i)
+        view = (i, first[1] if first else None,
+                self.text_widget.index("end"), self.winfo_height())
+        if view == self._drawn_view:
+            return
+        self._drawn_view = view
+        
+        self.delete("all")
         while True:
             dline = self.text_widget.dlineinfo(i)
             if dline is None:
@@ -45,6 +87,8 @@ class LineNumberCanvas(tk.Canvas):
 class SyntaxHighlightingText(tk.Text):
     """Text widget with syntax highlighting for CalcScript++"""
     
+    HIGHLIGHT_TAGS = ("comment", "string", "number", "keyword", "operator")
+    
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
         
@@ -58,7 +102,7 @@ class SyntaxHighlightingText(tk.Text):
             font=(ModernTheme.FONT_FAMILY, ModernTheme.FONT_SIZE),
             wrap=tk.NONE,
             undo=True,
-            maxundo=-1,
+            maxundo=200,  # Undo steps kept; unlimited grows without bound in long sessions
             insertwidth=2,
             spacing1=2,
             spacing3=2
@@ -72,20 +116,39 @@ class SyntaxHighlightingText(tk.Text):
         self.tag_configure("operator", foreground=ModernTheme.SYNTAX_OPERATOR)
         
         # Keywords
-        self.keywords = [
-            'int', 'long', 'float', 'string', 'boolean', 'array', 'matrix',
-            'if', 'else', 'while', 'for', 'repeat', 'times', 'function', 
-            'return', 'end', 'print', 'input', 'break', 'continue', 
-            'true', 'false', 'and', 'or', 'not'
-        ]
+        self.keywords = KEYWORDS
         
         # Bind events for auto-highlighting
+        self._highlight_job = None  # Pending after() id for a scheduled highlight
+        self._dirty_lines = None  # (first, last) lines edited since the last highlight
+        self._highlighted_line_count = 0  # Line count when the buffer was last fully tagged
         self.bind('<KeyRelease>', self._on_key_release)
         self.bind('<Return>', self._on_return)
     
     def _on_key_release(self, event=None):
-        """Highlight syntax on key release"""
-        self.after(1, self.highlight_syntax)
+        """Highlight syntax once a burst of key releases settles"""
+        line = int(self.index(tk.INSERT).split('.')[0])
+        if self._dirty_lines is None:
+            self._dirty_lines = (line, line)
+        else:
+            first, last = self._dirty_lines
+            self._dirty_lines = (min(first, line), max(last, line))
+        if self._highlight_job is None:
+            self._highlight_job = self.after(30, self._run_scheduled_highlight)
+    
+    def _run_scheduled_highlight(self):
+        self._highlight_job = None
+        first, last = self._dirty_lines
+        self._dirty_lines = None
+        if self._line_count() != self._highlighted_line_count:
+            # Lines were added or removed (newline, paste, cut); retag everything
+            self.highlight_syntax()
+        else:
+            # Re-tag only the edited lines plus one line of context either side
+            self.highlight_syntax(f"{max(first - 1, 1)}.0", f"{last + 2}.0")
+    
+    def _line_count(self):
+        return int(self.index("end-1c").split('.')[0])
     
     def _on_return(self, event=None):
         """Auto-indent on return"""
@@ -100,47 +163,67 @@ class SyntaxHighlightingText(tk.Text):
         self.insert("insert", "\n" + " " * indent)
         return "break"
     
-    def highlight_syntax(self):
-        """Apply syntax highlighting to all text"""
-        # Remove all existing tags
-        for tag in ["keyword", "number", "string", "comment", "operator"]:
-            self.tag_remove(tag, "1.0", tk.END)
-        
-        content = self.get("1.0", tk.END)
-        
-        # Highlight comments (# to end of line)
-        for match in re.finditer(r'#.*$', content, re.MULTILINE):
-            start_idx = f"1.0+{match.start()}c"
-            end_idx = f"1.0+{match.end()}c"
-            self.tag_add("comment", start_idx, end_idx)
-        
-        # Highlight strings
-        for match in re.finditer(r'"[^"]*"', content):
-            start_idx = f"1.0+{match.start()}c"
-            end_idx = f"1.0+{match.end()}c"
-            self.tag_add("string", start_idx, end_idx)
-        
-        # Highlight numbers
-        for match in re.finditer(r'\b\d+\.?\d*\b', content):
-            start_idx = f"1.0+{match.start()}c"
-            end_idx = f"1.0+{match.end()}c"
-            self.tag_add("number", start_idx, end_idx)
-        
-        # Highlight keywords
-        for keyword in self.keywords:
-            pattern = r'\b' + keyword + r'\b'
-            for match in re.finditer(pattern, content, re.IGNORECASE):
-                start_idx = f"1.0+{match.start()}c"
-                end_idx = f"1.0+{match.end()}c"
-                self.tag_add("keyword", start_idx, end_idx)
-        
-        # Highlight operators
-        operators = [r'\+', r'-', r'\*', r'/', r'%', r'=', r'<', r'>', r'!', r'&', r'\|']
-        for op in operators:
-            for match in re.finditer(op, content):
-                start_idx = f"1.0+{match.start()}c"
-                end_idx = f"1.0+{match.end()}c"
-                self.tag_add("operator", start_idx, end_idx)
+    def highlight_syntax(self, start="1.0", end=tk.END):
+        """Apply syntax highlighting to the text between start and end (default: all)
+        
+        Only tag runs that differ from what is already there are removed or
+        added, so unchanged text is not untagged and retagged
+        """
+        full = start == "1.0" and end == tk.END
+        if full:
+            self._highlighted_line_count = self._line_count()
+        start = self.index(start)
+        end = self.index(end)
+        content = self.get(start, end)
+        
+        # Match offsets -> "line.col" indices (Tk moves tags along with
+        # edits, so runs are compared in current index form)
+        first_line, first_col = map(int, start.split('.'))
+        line_starts = [0]
+        line_starts += [match.end() for match in re.finditer('\n', content)]
+        
+        def to_index(offset):
+            line = bisect_right(line_starts, offset) - 1
+            col = offset - line_starts[line] + (first_col if line == 0 else 0)
+            return f"{first_line + line}.{col}"
+        
+        # One pass over the text, merging touching matches into the
+        # maximal runs Tk reports back
+        spans = {tag: [] for tag in self.HIGHLIGHT_TAGS}
+        for match in _SYNTAX_RE.finditer(content):
+            tag_spans = spans[match.lastgroup]
+            if tag_spans and tag_spans[-1][1] == match.start():
+                tag_spans[-1][1] = match.end()
+            else:
+                tag_spans.append([match.start(), match.end()])
+        
+        for tag, tag_spans in spans.items():
+            wanted = {(to_index(a), to_index(b)) for a, b in tag_spans}
+            current = self._tag_runs(tag, start, end, full)
+            stale = current - wanted
+            if stale:
+                self.tk.call(self._w, 'tag', 'remove', tag, *(i for run in stale for i in run))
+            fresh = wanted - current
+            if fresh:
+                self.tag_add(tag, *(i for run in fresh for i in run))
+    
+    def _tag_runs(self, tag, start, end, full):
+        """Runs of tag clipped to [start, end), as (start, end) index pairs"""
+        if full:
+            flat = [str(index) for index in self.tag_ranges(tag)]
+            return set(zip(flat[::2], flat[1::2]))
+        runs = set()
+        # A run that starts before the range but reaches into it
+        before = self.tag_prevrange(tag, start)
+        if before and self.compare(before[1], '>', start):
+            runs.add((start, before[1] if self.compare(before[1], '<', end) else end))
+        index = start
+        while True:
+            run = self.tag_nextrange(tag, index, end)
+            if not run:
+                return runs
+            runs.add((run[0], run[1] if self.compare(run[1], '<', end) else end))
+            index = run[1]
 
 
 class CodeEditor(ttk.Frame):
@@ -174,9 +257,8 @@ class CodeEditor(ttk.Frame):
             xscrollcommand=self.h_scrollbar.set
         )
         
-        # Bind events
-        self.text_widget.bind('<Any-KeyPress>', lambda e: self.line_numbers.after(10, self.line_numbers.redraw))
-        self.text_widget.bind('<MouseWheel>', lambda e: self.line_numbers.after(10, self.line_numbers.redraw))
+        # Bind events (scrolling already redraws through _on_text_scroll)
+        self.text_widget.bind('<Any-KeyPress>', self.line_numbers.schedule_redraw)
         
         # Initial draw
         self.line_numbers.redraw()
@@ -191,10 +273,17 @@ class CodeEditor(ttk.Frame):
         return self.text_widget.get("1.0", tk.END).rstrip()
     
     def set_content(self, content):
-        """Set editor content"""
-        self.text_widget.delete("1.0", tk.END)
-        self.text_widget.insert("1.0", content)
-        self.text_widget.highlight_syntax()
+        """Set editor content as a single undo step"""
+        text = self.text_widget
+        # Without autoseparators the delete and the bulk insert share one
+        # undo record instead of two
+        text.configure(autoseparators=False)
+        text.edit_separator()
+        text.delete("1.0", tk.END)
+        text.insert("1.0", content)
+        text.edit_separator()
+        text.configure(autoseparators=True)
+        text.highlight_syntax()
         self.line_numbers.redraw()
     
     def clear(self):
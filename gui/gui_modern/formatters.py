@@ -2,6 +2,20 @@
 Output Formatters for Each Compiler Phase
 Formats phase results for display in the GUI
 """
+from dataclasses import fields, is_dataclass
+
+from .phase_service import CompileError  # Also puts the compiler phases on sys.path
+from ast_nodes import ASTNode
+
+
+def _group_symbols(symbols):
+    """Split (name, info) symbol entries into functions, variables and parameters in one pass"""
+    groups = {'function': [], 'variable': [], 'parameter': []}
+    for symbol in symbols:
+        if isinstance(symbol, tuple) and len(symbol) == 2:
+            sym_type = symbol[1].get('type', 'unknown')
+            groups.get(sym_type, groups['variable']).append(symbol)
+    return groups['function'], groups['variable'], groups['parameter']
 
 
 class TokensFormatter:
@@ -46,52 +60,58 @@ class ASTFormatter:
     
     @staticmethod
     def _print_tree(node, prefix="", is_last=True, is_root=False):
-        """Recursively print AST tree"""
-        if node is None:
-            return ""
-        
-        output = ""
-        
-        # Node connector
-        if not is_root:
-            connector = "└── " if is_last else "├── "
-            output += prefix + connector
-        
-        # Node type
-        node_type = type(node).__name__
-        output += node_type
-        
-        # Node details
-        if hasattr(node, 'value'):
-            output += f" [{node.value}]"
-        elif hasattr(node, 'name'):
-            output += f" [{node.name}]"
-        elif hasattr(node, 'op'):
-            output += f" [{node.op}]"
-        
-        output += "\n"
-        
-        # Get children
-        children = []
-        if hasattr(node, '__dict__'):
-            for key, value in node.__dict__.items():
-                if key.startswith('_'):
-                    continue
-                if isinstance(value, list):
-                    for item in value:
-                        if hasattr(item, '__class__') and 'Node' in item.__class__.__name__:
-                            children.append(item)
-                elif hasattr(value, '__class__') and 'Node' in value.__class__.__name__:
-                    children.append(value)
-        
-        # Print children
-        for i, child in enumerate(children):
-            is_last_child = (i == len(children) - 1)
+        """Print AST tree, walking it with an explicit stack"""
+        parts = []
+        stack = [(node, prefix, is_last, is_root)]
+        while stack:
+            node, prefix, is_last, is_root = stack.pop()
+            if node is None:
+                continue
+            
+            # Node connector
+            if not is_root:
+                connector = "└── " if is_last else "├── "
+                parts.append(prefix + connector)
+            
+            # Node type
+            parts.append(type(node).__name__)
+            
+            # Node details
+            # A child node value is drawn as a subtree below, so only plain values go here
+            value = getattr(node, 'value', None)
+            if value is not None and not isinstance(value, ASTNode):
+                parts.append(f" [{value}]")
+            elif hasattr(node, 'name'):
+                parts.append(f" [{node.name}]")
+            elif hasattr(node, 'op'):
+                parts.append(f" [{node.op}]")
+            
+            parts.append("\n")
+            
+            # Get children
+            children = []
+            if is_dataclass(node):
+                for field in fields(node):
+                    if not field.init:
+                        continue  # Annotations added by later phases
+                    key, value = field.name, getattr(node, field.name)
+                    if key.startswith('_'):
+                        continue
+                    if isinstance(value, list):
+                        for item in value:
+                            if hasattr(item, '__class__') and 'Node' in item.__class__.__name__:
+                                children.append(item)
+                    elif hasattr(value, '__class__') and 'Node' in value.__class__.__name__:
+                        children.append(value)
+            
+            # Queue children so the first one is printed next
             extension = "    " if is_last else "│   "
             child_prefix = prefix + extension if not is_root else ""
-            output += ASTFormatter._print_tree(child, child_prefix, is_last_child)
+            last = len(children) - 1
+            for i in range(last, -1, -1):
+                stack.append((children[i], child_prefix, i == last, False))
         
-        return output
+        return "".join(parts)
 
 
 class SemanticFormatter:
@@ -112,13 +132,11 @@ class SemanticFormatter:
         output += "-" * 80 + "\n\n"
         
         # Count by type
-        var_count = sum(1 for s in symbols if isinstance(s, tuple) and len(s) > 1 and s[1].get('type') == 'variable')
-        func_count = sum(1 for s in symbols if isinstance(s, tuple) and len(s) > 1 and s[1].get('type') == 'function')
-        param_count = sum(1 for s in symbols if isinstance(s, tuple) and len(s) > 1 and s[1].get('type') == 'parameter')
+        functions, variables, parameters = _group_symbols(symbols)
         
-        output += f"Variables:  {var_count}\n"
-        output += f"Functions:  {func_count}\n"
-        output += f"Parameters: {param_count}\n\n"
+        output += f"Variables:  {len(variables)}\n"
+        output += f"Functions:  {len(functions)}\n"
+        output += f"Parameters: {len(parameters)}\n\n"
         
         output += "✓ Type checking complete\n"
         output += "✓ Scope resolution complete\n"
@@ -155,20 +173,7 @@ class SymbolTableFormatter:
         output += f"Total Symbols: {len(symbols)}\n\n"
         
         # Separate by type
-        functions = []
-        variables = []
-        parameters = []
-        
-        for symbol in symbols:
-            if isinstance(symbol, tuple) and len(symbol) == 2:
-                name, info = symbol
-                sym_type = info.get('type', 'unknown')
-                if sym_type == 'function':
-                    functions.append((name, info))
-                elif sym_type == 'parameter':
-                    parameters.append((name, info))
-                else:
-                    variables.append((name, info))
+        functions, variables, parameters = _group_symbols(symbols)
         
         # Display Functions
         if functions:
@@ -323,12 +328,8 @@ class ErrorsFormatter:
         output += f"Total Errors: {len(errors)}\n\n"
         
         for i, error in enumerate(errors, 1):
-            if isinstance(error, dict):
-                phase = error.get('phase', '?')
-                err_type = error.get('type', '?')
-                message = error.get('message', '?')
-                line = error.get('line', 0)
-                column = error.get('column', 0)
+            if isinstance(error, CompileError):
+                phase, err_type, message, line, column = error
                 
                 output += f"Error #{i}:\n"
                 output += "-" * 100 + "\n"
@@ -4,7 +4,10 @@ Brings together all components with unique purple-gold-teal design
 """
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache, wraps
 from pathlib import Path
+import queue
 import sys
 
 # Import modern GUI components
@@ -12,12 +15,87 @@ from .theme import ModernTheme
 from .code_editor import CodeEditor
 from .output_sections import OutputSections
 from .phase_toolbar import PhaseToolbar
-from .phase_service import PhaseExecutionService
+from .phase_service import PhaseExecutionService, load_phases
 from .formatters import (
     TokensFormatter, ASTFormatter, SemanticFormatter, SymbolTableFormatter,
     IRFormatter, OptimizerFormatter, BytecodeFormatter, ErrorsFormatter
 )
 
+# Typing pause (ms) after which the editor contents are compiled in the background
+_PRECOMPILE_IDLE_MS = 500
+
+# Seconds between checks for a closed window while the worker waits for input
+_INPUT_POLL_SECONDS = 0.1
+
+# Put on an input reply queue when the window closes, in place of a value
+_WINDOW_CLOSED = object()
+
+# Program shown in the editor at startup
+_WELCOME_CODE = """# Welcome to CalcScript++ Compiler - Modern Edition!
+# 
+# This compiler has 6 phases:
+# Phase 1: Lexical Analysis (Tokenization)
+# Phase 2: Syntax Analysis (AST Generation)
+# Phase 3: Semantic Analysis (Type Checking)
+# Phase 4: IR Generation (Three-Address Code)
+# Phase 5: Optimization (Code Improvement)
+# Phase 6: Code Execution (Interpreter)
+#
+# Example with FOR LOOPS:
+
+int sum = 0
+for int i = 1; i <= 10; i = i + 1:
+    sum = sum + i
+end
+
+print "Sum from 1 to 10:"
+print sum
+
+# Click "▶ RUN ALL PHASES" to compile and execute!
+# Or click individual phase buttons to see step-by-step results.
+"""
+
+
+# Example programs offered in the toolbar
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent / 'test' / 'test_cases'
+_EXAMPLES = (
+    '1. COMPLIANCE_TEST.calc - Full Feature Demo',
+    '2. test_simple_typed.calc - Basic Types & Variables',
+    '3. test_manual_math.calc - Math Operations',
+    '4. test_matrix_operations.calc - Matrix Functions'
+)
+
+
+def _example_path(display_name):
+    """Map a menu entry (e.g. "1. COMPLIANCE_TEST.calc - Full Feature Demo") to its file"""
+    if '. ' in display_name and ' - ' in display_name:
+        display_name = display_name.split('. ')[1].split(' - ')[0]
+    return _EXAMPLES_DIR / display_name
+
+
+# Menu entry -> file, resolved once
+_EXAMPLE_PATHS = {display_name: _example_path(display_name) for display_name in _EXAMPLES}
+
+
+@lru_cache(maxsize=32)
+def _read_example(path, mtime_ns):
+    """Read an example file; the mtime in the key retires copies that were saved over"""
+    return Path(path).read_text(encoding='utf-8')
+
+
+def _holds_service(run_phase):
+    """Run a phase button handler only while no background job uses the phase service"""
+    @wraps(run_phase)
+    def wrapper(self):
+        if not self._claim_service():
+            return
+        self._phase_running = True
+        try:
+            return run_phase(self)
+        finally:
+            self._phase_running = False
+    return wrapper
+
 
 class ModernCompilerGUI:
     """Modern GUI for CalcScript++ Compiler with unique design"""
@@ -32,6 +110,17 @@ class ModernCompilerGUI:
         self.current_file = None
         self.phase_service = PhaseExecutionService()
         
+        # RUN ALL works on a background thread so the window keeps redrawing;
+        # the worker asks the Tk thread for program input through _input_requests
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._job = None
+        self._input_requests = queue.Queue()
+        self._precompile_idle_job = None  # after() id of the pending idle check
+        self._precompile_job = None  # Future of a background compile
+        self._phase_running = False  # A phase button is using phase_service on the Tk thread
+        self._closing = False  # Set by _on_close; the worker stops waiting for input
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        
         # Configure styles
         self._configure_styles()
         
@@ -40,6 +129,15 @@ class ModernCompilerGUI:
         
         # Load welcome code
         self._load_welcome_code()
+        
+        # Import the compiler phases on the worker once the window is up;
+        # a RUN ALL clicked before that just queues behind it
+        self._executor.submit(load_phases)
+        self._executor.submit(self._preload_examples)
+        
+        # Compile in the background once typing pauses, so RUN ALL finds
+        # the phase 1-5 results already cached
+        self.editor.text_widget.bind('<KeyRelease>', self._schedule_precompile, add='+')
     
     def _configure_styles(self):
         """Configure ttk styles"""
@@ -62,7 +160,8 @@ class ModernCompilerGUI:
                 'ir': self.run_phase_ir,
                 'opt': self.run_phase_opt,
                 'run': self.run_phase_run,
-                'run_all': self.run_all_phases
+                'run_all': self.run_all_phases,
+                'cancel': self.cancel_run
             }
         )
         self.phase_toolbar.pack(fill=tk.X, side=tk.TOP)
@@ -158,12 +257,7 @@ class ModernCompilerGUI:
             state='readonly',
             width=40
         )
-        example_menu['values'] = (
-            '1. COMPLIANCE_TEST.calc - Full Feature Demo',
-            '2. test_simple_typed.calc - Basic Types & Variables',
-            '3. test_manual_math.calc - Math Operations',
-            '4. test_matrix_operations.calc - Matrix Functions'
-        )
+        example_menu['values'] = _EXAMPLES
         example_menu.bind('<<ComboboxSelected>>', self._on_example_selected)
         example_menu.pack(side=tk.LEFT, padx=5, pady=10)
         
@@ -199,30 +293,7 @@ class ModernCompilerGUI:
     
     def _load_welcome_code(self):
         """Load welcome/example code"""
-        welcome = """# Welcome to CalcScript++ Compiler - Modern Edition!
-# 
-# This compiler has 6 phases:
-# Phase 1: Lexical Analysis (Tokenization)
-# Phase 2: Syntax Analysis (AST Generation)
-# Phase 3: Semantic Analysis (Type Checking)
-# Phase 4: IR Generation (Three-Address Code)
-# Phase 5: Optimization (Code Improvement)
-# Phase 6: Code Execution (Interpreter)
-#
-# Example with FOR LOOPS:
-
-int sum = 0
-for int i = 1; i <= 10; i = i + 1:
-    sum = sum + i
-end
-
-print "Sum from 1 to 10:"
-print sum
-
-# Click "▶ RUN ALL PHASES" to compile and execute!
-# Or click individual phase buttons to see step-by-step results.
-"""
-        self.editor.set_content(welcome)
+        self.editor.set_content(_WELCOME_CODE)
     
     def _on_example_selected(self, event=None):
         """Load selected example"""
@@ -285,21 +356,22 @@ print sum
             self.current_file = filename
             self.save_file()
     
+    def _preload_examples(self):
+        """Read the example files into the cache so the first pick is instant"""
+        for example_path in _EXAMPLE_PATHS.values():
+            try:
+                _read_example(str(example_path), example_path.stat().st_mtime_ns)
+            except OSError:
+                pass  # load_example reports it if the user picks this one
+    
     def load_example(self, display_name):
         """Load example file"""
         try:
-            # Extract filename from display name (e.g., "1. COMPLIANCE_TEST.calc - Full Feature Demo" -> "COMPLIANCE_TEST.calc")
-            if '. ' in display_name and ' - ' in display_name:
-                filename = display_name.split('. ')[1].split(' - ')[0]
-            else:
-                filename = display_name
-            
-            project_root = Path(__file__).parent.parent.parent
-            example_path = project_root / 'test' / 'test_cases' / filename
+            example_path = _EXAMPLE_PATHS.get(display_name) or _example_path(display_name)
+            filename = example_path.name
             
             if example_path.exists():
-                with open(example_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = _read_example(str(example_path), example_path.stat().st_mtime_ns)
                 self.editor.set_content(content)
                 self.current_file = str(example_path)
                 self.output_sections.clear_all()
@@ -314,6 +386,7 @@ print sum
     # PHASE EXECUTION
     # =========================================================================
     
+    @_holds_service
     def run_phase_lex(self):
         """Run Phase 1: Lexical Analysis"""
         source_code = self.editor.get_content()
@@ -334,6 +407,7 @@ print sum
             self._show_errors(result.get('errors', []))
             self.status_bar.config(text="✗ Phase 1 Failed: Lexical Analysis")
     
+    @_holds_service
     def run_phase_parse(self):
         """Run Phase 2: Syntax Analysis"""
         if not self.phase_service.tokens:
@@ -355,6 +429,7 @@ print sum
             self._show_errors(result.get('errors', []))
             self.status_bar.config(text="✗ Phase 2 Failed: Syntax Analysis")
     
+    @_holds_service
     def run_phase_check(self):
         """Run Phase 3: Semantic Analysis"""
         if not self.phase_service.ast:
@@ -381,6 +456,7 @@ print sum
             self._show_errors(result.get('errors', []))
             self.status_bar.config(text="✗ Phase 3 Failed: Semantic Analysis")
     
+    @_holds_service
     def run_phase_ir(self):
         """Run Phase 4: IR Generation"""
         if not self.phase_service.ast:
@@ -402,6 +478,7 @@ print sum
             self._show_errors(result.get('errors', []))
             self.status_bar.config(text="✗ Phase 4 Failed: IR Generation")
     
+    @_holds_service
     def run_phase_opt(self):
         """Run Phase 5: Optimization"""
         if not self.phase_service.tac:
@@ -435,6 +512,7 @@ print sum
             return ""
         return value
     
+    @_holds_service
     def run_phase_run(self):
         """Run Phase 6: Execution"""
         if not self.phase_service.optimized_tac:
@@ -467,13 +545,98 @@ print sum
             messagebox.showwarning("Warning", "Please enter some code first.")
             return
         
+        if self._job is not None or self._phase_running:
+            messagebox.showinfo("Busy", "A run is already in progress.")
+            return
+        
         self.output_sections.clear_all()
         self.status_bar.config(text="Running all phases...")
-        self.root.update()
         
-        # Execute all phases
-        results = self.phase_service.execute_all_phases(source_code, input_callback=self._get_input_from_user)
+        # Execute all phases on the worker; _poll_job picks up the results
+        self._job = self._executor.submit(
+            self.phase_service.execute_all_phases, source_code,
+            input_callback=self._request_input_from_worker
+        )
+        self.root.after(50, self._poll_job)
+    
+    def _schedule_precompile(self, event=None):
+        """Restart the idle timer for a background compile"""
+        if self._precompile_idle_job is not None:
+            self.root.after_cancel(self._precompile_idle_job)
+        self._precompile_idle_job = self.root.after(_PRECOMPILE_IDLE_MS, self._precompile)
+    
+    def _precompile(self):
+        """Compile the editor contents on the worker if it has nothing else to do"""
+        self._precompile_idle_job = None
+        if self._job is not None or self._phase_running:
+            return  # RUN ALL or a phase button in progress
+        if self._precompile_job is not None and not self._precompile_job.done():
+            return  # Still compiling an earlier version; the next pause catches up
+        self._precompile_job = self._executor.submit(
+            self.phase_service.precompile, self.editor.get_content()
+        )
+    
+    def _claim_service(self):
+        """Whether the Tk thread may use phase_service now; waits out a background compile"""
+        if self._job is not None or self._phase_running:
+            messagebox.showinfo("Busy", "A run is already in progress.")
+            return False
+        precompile = self._precompile_job
+        if precompile is not None:
+            if not precompile.cancel():
+                wait([precompile])  # Already compiling; it finishes shortly
+            self._precompile_job = None
+        return True
+    
+    def cancel_run(self):
+        """Stop the program started by RUN ALL"""
+        if self._job is None:
+            return
+        if not self._job.cancel():
+            self.phase_service.cancel()  # Already running; stop at the next jump or call
+        self.status_bar.config(text="Cancelling...")
+    
+    def _request_input_from_worker(self):
+        """Input callback for the worker thread; the dialog itself runs on the Tk thread"""
+        reply = queue.Queue(maxsize=1)
+        self._input_requests.put(reply)
+        # Poll, so a request the Tk thread never sees still ends with the window
+        while True:
+            try:
+                value = reply.get(timeout=_INPUT_POLL_SECONDS)
+            except queue.Empty:
+                if self._closing:
+                    value = _WINDOW_CLOSED
+                else:
+                    continue
+            if value is _WINDOW_CLOSED:
+                raise RuntimeError("Execution cancelled")
+            return value
+    
+    def _poll_job(self):
+        """Serve input requests and display results once the RUN ALL job finishes"""
+        while not self._input_requests.empty():
+            self._input_requests.get_nowait().put(self._get_input_from_user())
+        
+        job = self._job
+        if not job.done():
+            self.root.after(50, self._poll_job)
+            return
+        self._job = None
         
+        if job.cancelled():
+            self.status_bar.config(text="✗ Run cancelled")
+            return
+        try:
+            results = job.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Compilation failed: {e}")
+            self.status_bar.config(text="✗ Compilation Failed")
+            return
+        self._show_all_results(results)
+    
+    def _show_all_results(self, results):
+        """Display the results of every phase RUN ALL reached"""
         # Display results for each phase
         if 'lex' in results and results['lex']['success']:
             formatted = TokensFormatter.format(results['lex']['tokens'])
@@ -523,6 +686,16 @@ print sum
         """Display errors in errors section"""
         formatted = ErrorsFormatter.format(errors)
         self.output_sections.set_content('errors', formatted, auto_expand=True)
+    
+    def _on_close(self):
+        """Stop any running program so the worker thread can exit with the window"""
+        self._closing = True
+        self.phase_service.cancel()
+        # Wake a program waiting for input
+        while not self._input_requests.empty():
+            self._input_requests.get_nowait().put(_WINDOW_CLOSED)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
 
 def main():
@@ -183,7 +183,8 @@ class OutputSections(tk.Frame):
                 'key': 'output',
                 'title': 'Output',
                 'emoji': '📤',
-                'color': ModernTheme.SUCCESS
+                'color': ModernTheme.SUCCESS,
+                'max_lines': 10000  # Long-running programs keep only their tail
             },
             {
                 'key': 'errors',
@@ -215,19 +216,35 @@ class OutputSections(tk.Frame):
             
             self.sections[config['key']] = {
                 'section': section,
-                'text': text_widget
+                'text': text_widget,
+                'max_lines': config.get('max_lines')
             }
     
     def set_content(self, key, content, auto_expand=True):
         """Set content for a section"""
         if key in self.sections:
             text_widget = self.sections[key]['text']
+            max_lines = self.sections[key]['max_lines']
+            if max_lines:
+                content = self._tail_lines(content, max_lines)
             text_widget.delete('1.0', tk.END)
             text_widget.insert('1.0', content)
             
             if auto_expand:
                 self.sections[key]['section'].expand()
     
+    @staticmethod
+    def _tail_lines(content, max_lines):
+        """Keep the last max_lines lines of content, noting how many were dropped"""
+        # A final newline ends the last line rather than starting an empty one
+        trailing = '\n' if content.endswith('\n') else ''
+        body = content[:len(content) - len(trailing)]
+        parts = body.rsplit('\n', max_lines)  # Dropped head, then the kept lines
+        if len(parts) <= max_lines:
+            return content
+        dropped = parts[0].count('\n') + 1
+        return f"... {dropped} earlier lines not shown ...\n" + '\n'.join(parts[1:]) + trailing
+    
     def get_text_widget(self, key):
         """Get text widget for a section"""
         if key in self.sections:
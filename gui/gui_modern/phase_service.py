@@ -3,30 +3,91 @@ Phase Execution Service
 Handles individual phase execution and results
 """
 import sys
-import io
+import re
+import hashlib
+from collections import namedtuple
 from pathlib import Path
 
-# Add compiler phases to path
+# Add compiler phases to path (skipping any already there, so reloading
+# this module doesn't keep growing sys.path)
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / 'Compiler' / 'Phase1_Lexical_Analysis'))
-sys.path.insert(0, str(project_root / 'Compiler' / 'Phase2_Syntax_Analysis'))
-sys.path.insert(0, str(project_root / 'Compiler' / 'Phase3_Semantic_Analysis'))
-sys.path.insert(0, str(project_root / 'Compiler' / 'Phase4_Intermediate_Code'))
-sys.path.insert(0, str(project_root / 'Compiler' / 'Phase5_Optimization'))
-sys.path.insert(0, str(project_root / 'Compiler' / 'Phase6_Code_Generation'))
+for phase_dir in ('Phase1_Lexical_Analysis', 'Phase2_Syntax_Analysis',
+                  'Phase3_Semantic_Analysis', 'Phase4_Intermediate_Code',
+                  'Phase5_Optimization', 'Phase6_Code_Generation'):
+    phase_path = str(project_root / 'Compiler' / phase_dir)
+    if phase_path not in sys.path:
+        sys.path.insert(0, phase_path)
 
-from lexer import Lexer
-from parser import Parser
-from semantic_analyzer import SemanticAnalyzer
-from ir_generator import IRGenerator
-from optimizer import Optimizer
-from interpreter import Interpreter
+# Phase classes, imported by load_phases() on first use so the window can
+# paint before the compiler modules (and NumPy behind them) are loaded
+Lexer = Parser = SemanticAnalyzer = SemanticError = IRGenerator = Optimizer = Interpreter = None
+
+
+def load_phases():
+    """Import the compiler phase modules if they are not loaded yet"""
+    global Lexer, Parser, SemanticAnalyzer, SemanticError, IRGenerator, Optimizer, Interpreter
+    if Interpreter is not None:
+        return
+    from lexer import Lexer
+    from parser import Parser
+    from semantic_analyzer import SemanticAnalyzer, SemanticError
+    from ir_generator import IRGenerator
+    from optimizer import Optimizer
+    from interpreter import Interpreter  # Bound last: set means all are loaded
+
+# Phases whose results depend only on the source text
+_COMPILE_PHASES = ('lex', 'parse', 'check', 'ir', 'opt')
+
+# Number of recently compiled sources kept by execute_all_phases
+_PHASE_CACHE_SIZE = 8
+
+# Error message patterns
+_LINE_COL_RE = re.compile(r'line (\d+),?\s*column (\d+)', re.IGNORECASE)
+_LINE_RE = re.compile(r'line (\d+)', re.IGNORECASE)
+_ERROR_PREFIX_RE = re.compile(r'^(Syntax|Semantic|Lexical)\s+error\s+at\s+line\s+\d+,?\s*column\s+\d+:\s*', re.IGNORECASE)
+_SEMANTIC_FAILED_RE = re.compile(r'^Semantic analysis failed:\s*', re.IGNORECASE)
+
+# One entry of PhaseExecutionService.errors; line and column are 0 when unknown
+CompileError = namedtuple('CompileError', 'phase type message line column')
+
+# Phase -> (result key, service attribute) of the artifact each phase produces
+_STAGE_ARTIFACTS = {
+    'lex': ('tokens', 'tokens'),
+    'parse': ('ast', 'ast'),
+    'check': ('semantic_info', 'semantic_info'),
+    'ir': ('tac', 'tac'),
+    'opt': ('optimized_tac', 'optimized_tac')
+}
+
+
+class _OutputBuffer:
+    """Write-only text sink that keeps the written chunks and joins them once"""
+    
+    def __init__(self):
+        self.chunks = []
+        self.write = self.chunks.append
+    
+    def flush(self):
+        pass
+    
+    def getvalue(self):
+        return ''.join(self.chunks)
 
 
 class PhaseExecutionService:
     """Service for executing compiler phases individually or all at once"""
     
+    __slots__ = ('source_code', 'tokens', 'ast', 'semantic_info', 'tac', 'optimized_tac',
+                 'bytecode', 'errors', 'phase_logs',
+                 '_phase_cache', '_stage_memo', '_interpreter')
+    
     def __init__(self):
+        # SHA-256 of source -> artifacts of its last successful compile
+        self._phase_cache = {}
+        # Phase -> (input, result) of its last successful run, so rerunning a
+        # phase on the very same upstream artifact skips the work
+        self._stage_memo = {}
+        self._interpreter = None  # Set while phase 6 is running
         self.reset()
     
     def reset(self):
@@ -48,297 +109,270 @@ class PhaseExecutionService:
             'run': None
         }
     
+    def _reuse_stage(self, phase, stage_input):
+        """Return the last result of phase if it ran on this exact input, else None"""
+        memo = self._stage_memo.get(phase)
+        if memo is None:
+            return None
+        last_input, result = memo
+        # Source text compares by value; artifacts by identity
+        if last_input is not stage_input and not (phase == 'lex' and last_input == stage_input):
+            return None
+        key, attr = _STAGE_ARTIFACTS[phase]
+        setattr(self, attr, result[key])
+        self.phase_logs[phase] = result['log']
+        return dict(result)
+    
     def _extract_line_col(self, error_msg):
         """Extract line and column numbers from error message"""
-        import re
         # Try to find "line X, column Y" pattern
-        match = re.search(r'line (\d+),?\s*column (\d+)', error_msg, re.IGNORECASE)
+        match = _LINE_COL_RE.search(error_msg)
         if match:
             return int(match.group(1)), int(match.group(2))
         
         # Try to find "Line X" pattern
-        match = re.search(r'line (\d+)', error_msg, re.IGNORECASE)
+        match = _LINE_RE.search(error_msg)
         if match:
             return int(match.group(1)), 0
         
         return 0, 0
     
+    def _record_error(self, phase, error_msg, error_type='Error'):
+        """Add error_msg to the error list and return the failed phase result"""
+        line, column = self._extract_line_col(error_msg)
+        self.errors.append(CompileError(phase, error_type, self._clean_error_message(error_msg), line, column))
+        return {
+            'success': False,
+            'error': error_msg,
+            'errors': self.errors
+        }
+    
     def _clean_error_message(self, error_msg):
         """Clean up error message to remove redundant info"""
-        import re
         # Remove "Syntax error at line X, column Y: " prefix if present
-        cleaned = re.sub(r'^(Syntax|Semantic|Lexical)\s+error\s+at\s+line\s+\d+,?\s*column\s+\d+:\s*', '', error_msg, flags=re.IGNORECASE)
+        cleaned = _ERROR_PREFIX_RE.sub('', error_msg)
         # Remove "Semantic analysis failed:" prefix if present
-        cleaned = re.sub(r'^Semantic analysis failed:\s*', '', cleaned, flags=re.IGNORECASE)
+        cleaned = _SEMANTIC_FAILED_RE.sub('', cleaned)
         return cleaned.strip()
     
     def execute_phase_lex(self, source_code):
         """Phase 1: Lexical Analysis"""
+        load_phases()
         self.source_code = source_code
         self.errors = []
         
+        reused = self._reuse_stage('lex', source_code)
+        if reused is not None:
+            return reused
+        
         try:
             lexer = Lexer(source_code)
             self.tokens = lexer.tokenize()
-            self.phase_logs['lex'] = f"Lexical analysis complete. {len([t for t in self.tokens if t.type.name != 'EOF'])} tokens generated."
-            return {
+            # The lexer emits a single EOF token, always last
+            token_count = len(self.tokens) - (self.tokens[-1].type.name == 'EOF' if self.tokens else 0)
+            self.phase_logs['lex'] = f"Lexical analysis complete. {token_count} tokens generated."
+            result = {
                 'success': True,
                 'tokens': self.tokens,
                 'log': self.phase_logs['lex']
             }
+            self._stage_memo['lex'] = (source_code, result)
+            return dict(result)
         except Exception as e:
-            error_msg = str(e)
-            line, column = self._extract_line_col(error_msg)
-            self.errors.append({
-                'phase': 'Lexical',
-                'type': 'Error',
-                'message': self._clean_error_message(error_msg),
-                'line': line,
-                'column': column
-            })
-            return {
-                'success': False,
-                'error': error_msg,
-                'errors': self.errors
-            }
+            return self._record_error('Lexical', str(e))
     
     def execute_phase_parse(self):
         """Phase 2: Syntax Analysis"""
+        load_phases()
         if not self.tokens:
             return {'success': False, 'error': 'No tokens available. Run Phase 1 first.'}
         
+        tokens = self.tokens
+        reused = self._reuse_stage('parse', tokens)
+        if reused is not None:
+            return reused
+        
         try:
-            parser = Parser(self.tokens)
+            parser = Parser(tokens)
             self.ast = parser.parse()
             self.phase_logs['parse'] = f"Syntax analysis complete. AST generated with root type: {type(self.ast).__name__}"
-            return {
+            result = {
                 'success': True,
                 'ast': self.ast,
                 'log': self.phase_logs['parse']
             }
+            self._stage_memo['parse'] = (tokens, result)
+            return dict(result)
         except Exception as e:
-            error_msg = str(e)
-            line, column = self._extract_line_col(error_msg)
-            self.errors.append({
-                'phase': 'Syntax',
-                'type': 'Error',
-                'message': self._clean_error_message(error_msg),
-                'line': line,
-                'column': column
-            })
-            return {
-                'success': False,
-                'error': error_msg,
-                'errors': self.errors
-            }
+            return self._record_error('Syntax', str(e))
     
     def execute_phase_check(self):
         """Phase 3: Semantic Analysis"""
+        load_phases()
         if not self.ast:
             return {'success': False, 'error': 'No AST available. Run Phase 2 first.'}
         
+        ast = self.ast
+        reused = self._reuse_stage('check', ast)
+        if reused is not None:
+            return reused
+        
         try:
             analyzer = SemanticAnalyzer()
-            analyzer.analyze(self.ast)
+            analyzer.analyze(ast)
             self.semantic_info = {
-                'symbols': analyzer.all_symbols if hasattr(analyzer, 'all_symbols') else [],
-                'errors': analyzer.errors if hasattr(analyzer, 'errors') else []
+                'symbols': analyzer.all_symbols,
+                'errors': analyzer.errors
             }
             
             self.phase_logs['check'] = f"Semantic analysis complete. {len(self.semantic_info['symbols'])} symbols analyzed."
-            return {
+            result = {
                 'success': True,
                 'semantic_info': self.semantic_info,
                 'log': self.phase_logs['check']
             }
-        except Exception as e:
-            error_msg = str(e)
-            
-            # Try to extract structured errors from semantic analyzer
-            try:
-                import re
-                # Parse the formatted error message
-                error_blocks = error_msg.split('\n\n')
-                for block in error_blocks:
-                    if not block.strip() or 'Semantic analysis failed' in block:
-                        continue
-                    
-                    # Extract error details
-                    line_match = re.search(r'Line (\d+)', block)
-                    col_match = re.search(r'Column (\d+)', block)
-                    msg_match = re.search(r'\n  ([^\n]+?)(?:\n|$)', block)
-                    suggestion_match = re.search(r'💡 Suggestion: ([^\n]+)', block)
-                    
-                    message = msg_match.group(1) if msg_match else block.strip()
-                    line = int(line_match.group(1)) if line_match else 0
-                    column = int(col_match.group(1)) if col_match else 0
-                    
-                    # Format message with suggestion if available
-                    if suggestion_match:
-                        message += f" (Suggestion: {suggestion_match.group(1)})"
-                    
-                    self.errors.append({
-                        'phase': 'Semantic',
-                        'type': 'Error',
-                        'message': message,
-                        'line': line,
-                        'column': column
-                    })
-            except:
-                # Fallback: add the whole error message
-                line, column = self._extract_line_col(error_msg)
-                self.errors.append({
-                    'phase': 'Semantic',
-                    'type': 'Error',
-                    'message': self._clean_error_message(error_msg),
-                    'line': line,
-                    'column': column
-                })
-            
+            self._stage_memo['check'] = (ast, result)
+            return dict(result)
+        except SemanticError as e:
+            # Take the analyzer's structured errors as they are rather than
+            # parsing them back out of the report text
+            for err in e.errors:
+                message = SemanticError.describe(err)
+                if err.get('suggestion'):
+                    message += f" (Suggestion: {err['suggestion']})"
+                line = err['line'] or 0
+                self.errors.append(CompileError('Semantic', 'Error', message, line,
+                                                (err['column'] or 0) if line else 0))
+            if e.suppressed_errors:
+                self.errors.append(CompileError('Semantic', 'Error',
+                                                f"... and {e.suppressed_errors} more error(s) not shown", 0, 0))
             return {
                 'success': False,
-                'error': error_msg,
+                'error': str(e),
                 'errors': self.errors
             }
+        except Exception as e:
+            return self._record_error('Semantic', str(e))
     
     def execute_phase_ir(self):
         """Phase 4: Intermediate Code Generation"""
+        load_phases()
         if not self.ast:
             return {'success': False, 'error': 'No AST available. Run Phase 3 first.'}
         
+        ast = self.ast
+        reused = self._reuse_stage('ir', ast)
+        if reused is not None:
+            return reused
+        
         try:
             ir_gen = IRGenerator()
-            self.tac = ir_gen.generate(self.ast)
+            self.tac = ir_gen.generate(ast)
             self.phase_logs['ir'] = f"IR generation complete. {len(self.tac) if self.tac else 0} TAC instructions generated."
-            return {
+            result = {
                 'success': True,
                 'tac': self.tac,
                 'log': self.phase_logs['ir']
             }
+            self._stage_memo['ir'] = (ast, result)
+            return dict(result)
         except Exception as e:
-            error_msg = str(e)
-            line, column = self._extract_line_col(error_msg)
-            self.errors.append({
-                'phase': 'IR Generation',
-                'type': 'Error',
-                'message': self._clean_error_message(error_msg),
-                'line': line,
-                'column': column
-            })
-            return {
-                'success': False,
-                'error': error_msg,
-                'errors': self.errors
-            }
+            return self._record_error('IR Generation', str(e))
     
     def execute_phase_opt(self):
         """Phase 5: Optimization"""
+        load_phases()
         if not self.tac:
             return {'success': False, 'error': 'No TAC available. Run Phase 4 first.'}
         
+        tac = self.tac
+        reused = self._reuse_stage('opt', tac)
+        if reused is not None:
+            return reused
+        
         try:
             optimizer = Optimizer()
-            self.optimized_tac = optimizer.optimize(self.tac)
+            self.optimized_tac = optimizer.optimize(tac)
             
             original_count = len(self.tac) if self.tac else 0
             optimized_count = len(self.optimized_tac) if self.optimized_tac else 0
             saved = original_count - optimized_count
             
             self.phase_logs['opt'] = f"Optimization complete. {saved} instructions eliminated."
-            return {
+            result = {
                 'success': True,
                 'optimized_tac': self.optimized_tac,
-                'original_tac': self.tac,
+                'original_tac': tac,
                 'log': self.phase_logs['opt']
             }
+            self._stage_memo['opt'] = (tac, result)
+            return dict(result)
         except Exception as e:
-            error_msg = str(e)
-            line, column = self._extract_line_col(error_msg)
-            self.errors.append({
-                'phase': 'Optimization',
-                'type': 'Error',
-                'message': self._clean_error_message(error_msg),
-                'line': line,
-                'column': column
-            })
-            return {
-                'success': False,
-                'error': error_msg,
-                'errors': self.errors
-            }
+            return self._record_error('Optimization', str(e))
     
     def execute_phase_run(self, input_callback=None):
         """Phase 6: Code Execution"""
+        load_phases()
         if not self.optimized_tac:
             return {'success': False, 'error': 'No optimized code available. Run Phase 5 first.'}
         
-        # Capture output
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
+        # Capture output in a buffer owned by this run; swapping sys.stdout
+        # would also capture prints from any other thread
+        output = _OutputBuffer()
         
         try:
-            interpreter = Interpreter(input_callback=input_callback)
+            interpreter = Interpreter(input_callback=input_callback, output_stream=output)
+            self._interpreter = interpreter
             interpreter.execute(self.optimized_tac)
-            output = sys.stdout.getvalue()
             
             self.phase_logs['run'] = f"Execution complete. Program ran successfully."
             return {
                 'success': True,
-                'output': output,
+                'output': output.getvalue(),
                 'log': self.phase_logs['run']
             }
         except Exception as e:
-            error_msg = str(e)
-            line, column = self._extract_line_col(error_msg)
-            self.errors.append({
-                'phase': 'Execution',
-                'type': 'Runtime Error',
-                'message': self._clean_error_message(error_msg),
-                'line': line,
-                'column': column
-            })
-            return {
-                'success': False,
-                'error': error_msg,
-                'output': sys.stdout.getvalue(),
-                'errors': self.errors
-            }
+            result = self._record_error('Execution', str(e), 'Runtime Error')
+            result['output'] = output.getvalue()
+            return result
         finally:
-            sys.stdout = old_stdout
+            self._interpreter = None
+    
+    def cancel(self):
+        """Stop a program running in phase 6 (safe to call from another thread)"""
+        interpreter = self._interpreter
+        if interpreter is not None:
+            interpreter.cancel()
+    
+    def _restore_compiled(self, key, source_code):
+        """Reload cached phase 1-5 artifacts for this source, or return None"""
+        entry = self._phase_cache.get(key)
+        if entry is None:
+            return None
+        self.source_code = source_code
+        self.errors = []
+        (self.tokens, self.ast, self.semantic_info, self.tac,
+         self.optimized_tac, logs, results) = entry
+        self.phase_logs.update(logs)
+        return dict(results)
+    
+    def _remember_compiled(self, key, results):
+        """Cache the artifacts of a successful phase 1-5 run"""
+        if len(self._phase_cache) >= _PHASE_CACHE_SIZE:
+            del self._phase_cache[next(iter(self._phase_cache))]  # Oldest entry
+        logs = {phase: self.phase_logs[phase] for phase in _COMPILE_PHASES}
+        self._phase_cache[key] = (self.tokens, self.ast, self.semantic_info, self.tac,
+                                  self.optimized_tac, logs, dict(results))
     
     def execute_all_phases(self, source_code, input_callback=None):
-        """Execute all phases sequentially"""
-        results = {}
-        
-        # Phase 1: Lex
-        result = self.execute_phase_lex(source_code)
-        results['lex'] = result
-        if not result['success']:
-            return results
-        
-        # Phase 2: Parse
-        result = self.execute_phase_parse()
-        results['parse'] = result
-        if not result['success']:
-            return results
-        
-        # Phase 3: Semantic Check
-        result = self.execute_phase_check()
-        results['check'] = result
-        if not result['success']:
-            return results
-        
-        # Phase 4: IR Generation
-        result = self.execute_phase_ir()
-        results['ir'] = result
-        if not result['success']:
-            return results
-        
-        # Phase 5: Optimization
-        result = self.execute_phase_opt()
-        results['opt'] = result
-        if not result['success']:
-            return results
+        """Execute all phases sequentially; unchanged source reuses its last compile"""
+        key = hashlib.sha256(source_code.encode('utf-8')).hexdigest()
+        results = self._restore_compiled(key, source_code)
+        if results is None:
+            results = self._compile_all_phases(source_code)
+            if not self._compiled_ok(results):
+                return results
+            self._remember_compiled(key, results)
         
         # Phase 6: Execution
         result = self.execute_phase_run(input_callback=input_callback)
@@ -346,6 +380,40 @@ class PhaseExecutionService:
         
         return results
     
+    def precompile(self, source_code):
+        """Compile source into the phase cache without touching the displayed results"""
+        key = hashlib.sha256(source_code.encode('utf-8')).hexdigest()
+        if key in self._phase_cache:
+            return
+        # A scratch service does the work, so the step-by-step state shown
+        # in the GUI is left alone; only the cache entry is shared
+        scratch = PhaseExecutionService()
+        scratch._phase_cache = self._phase_cache
+        results = scratch._compile_all_phases(source_code)
+        if self._compiled_ok(results):
+            scratch._remember_compiled(key, results)
+    
+    @staticmethod
+    def _compiled_ok(results):
+        """Whether every phase 1-5 succeeded"""
+        return all(results.get(phase, {}).get('success') for phase in _COMPILE_PHASES)
+    
+    def _compile_all_phases(self, source_code):
+        """Run phases 1-5, stopping at the first failure"""
+        results = {}
+        phases = (
+            ('lex', lambda: self.execute_phase_lex(source_code)),
+            ('parse', self.execute_phase_parse),
+            ('check', self.execute_phase_check),
+            ('ir', self.execute_phase_ir),
+            ('opt', self.execute_phase_opt)
+        )
+        for phase, execute in phases:
+            results[phase] = result = execute()
+            if not result['success']:
+                break
+        return results
+    
     def get_errors(self):
         """Get all accumulated errors"""
         return self.errors
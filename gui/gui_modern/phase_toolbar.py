@@ -82,7 +82,7 @@ class PhaseToolbar(tk.Frame):
                 left_frame,
                 config['text'],
                 config['color'],
-                lambda k=config['key']: phase_callbacks[k]()
+                phase_callbacks[config['key']]
             )
             btn.pack(side=tk.LEFT, padx=5)
         
@@ -102,3 +102,13 @@ class PhaseToolbar(tk.Frame):
             pady=10
         )
         self.run_all_button.pack(side=tk.RIGHT)
+        
+        # Cancel button for a RUN ALL that is still working
+        if 'cancel' in phase_callbacks:
+            self.cancel_button = PhaseButton(
+                right_frame,
+                '■ CANCEL',
+                ModernTheme.ERROR,
+                phase_callbacks['cancel']
+            )
+            self.cancel_button.pack(side=tk.RIGHT, padx=5)
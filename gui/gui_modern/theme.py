@@ -34,6 +34,7 @@ class ModernTheme:
     PHASE_IR = '#FF6B6B'         # Coral
     PHASE_OPT = '#00FF7F'        # Green
     PHASE_RUN = '#FF1493'        # Pink
+    PHASE_COLORS = (PHASE_LEX, PHASE_PARSE, PHASE_CHECK, PHASE_IR, PHASE_OPT, PHASE_RUN)
     
     # UI Element Colors
     BUTTON_HOVER = '#5A5A7A'
@@ -57,14 +58,9 @@ class ModernTheme:
     @staticmethod
     def get_phase_color(phase_num):
         """Get color for phase button by number"""
-        colors = [
-            ModernTheme.PHASE_LEX,
-            ModernTheme.PHASE_PARSE,
-            ModernTheme.PHASE_CHECK,
-            ModernTheme.PHASE_IR,
-            ModernTheme.PHASE_OPT,
-            ModernTheme.PHASE_RUN
-        ]
-        if 0 <= phase_num < len(colors):
-            return colors[phase_num]
+        if phase_num >= 0:  # Negative numbers would index from the end
+            try:
+                return ModernTheme.PHASE_COLORS[phase_num]
+            except IndexError:
+                pass
         return ModernTheme.DEEP_PURPLE
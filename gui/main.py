@@ -6,6 +6,7 @@
 
 import sys
 import argparse
+from dataclasses import fields, is_dataclass
 from pathlib import Path
 
 # Add parent directories to path
@@ -18,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'Compiler' / 'Phase6_Code_
 
 from lexer import Lexer
 from parser import Parser
+from ast_nodes import ASTNode
 from semantic_analyzer import SemanticAnalyzer
 from ir_generator import IRGenerator
 from optimizer import Optimizer
@@ -51,9 +53,7 @@ class CalcScriptCompiler:
             
             if self.options.get('show_tokens'):
                 print("\nTokens:")
-                for token in self.tokens:
-                    if token.type.name != 'EOF':
-                        print(f"  {token}")
+                self.print_lines(f"  {token}" for token in self.tokens if token.type.name != 'EOF')
                 print()
             
             # Phase 2: Syntax Analysis
@@ -76,7 +76,7 @@ class CalcScriptCompiler:
                 print("PHASE 3: SEMANTIC ANALYSIS")
                 print("=" * 70)
             
-            analyzer = SemanticAnalyzer()
+            analyzer = SemanticAnalyzer(track_symbols=False)  # The CLI never shows the symbol table
             analyzer.analyze(self.ast)
             
             if self.options.get('verbose'):
@@ -94,8 +94,7 @@ class CalcScriptCompiler:
             
             if self.options.get('show_tac'):
                 print("\nThree-Address Code (Before Optimization):")
-                for i, instr in enumerate(self.tac):
-                    print(f"  {i:3d}: {instr}")
+                self.print_lines(f"  {i:3d}: {instr}" for i, instr in enumerate(self.tac))
                 print()
             
             # Phase 5: Optimization
@@ -109,8 +108,7 @@ class CalcScriptCompiler:
             
             if self.options.get('show_optimized') or self.options.get('verbose'):
                 print("\nThree-Address Code (After Optimization):")
-                for i, instr in enumerate(self.optimized_tac):
-                    print(f"  {i:3d}: {instr}")
+                self.print_lines(f"  {i:3d}: {instr}" for i, instr in enumerate(self.optimized_tac))
                 print()
                 
                 if optimizer.optimizations_applied:
@@ -130,7 +128,7 @@ class CalcScriptCompiler:
                 print()
             
             if not self.options.get('no_execute'):
-                interpreter = Interpreter()
+                interpreter = Interpreter(fast_math=self.options.get('fast_math', False))
                 interpreter.execute(self.optimized_tac)
             
             if self.options.get('verbose'):
@@ -148,30 +146,70 @@ class CalcScriptCompiler:
                 traceback.print_exc()
             sys.exit(1)
     
+    def print_lines(self, lines):
+        """Print a sequence of lines with a single write"""
+        text = "\n".join(lines)
+        if text:
+            print(text)
+    
     def print_ast(self, node, indent=0):
         """Pretty print the AST"""
-        prefix = "  " * indent
-        node_name = node.__class__.__name__
-        print(f"{prefix}{node_name}")
-        
-        # Print node attributes
-        if hasattr(node, '__dict__'):
-            for key, value in node.__dict__.items():
+        lines = []
+        # Explicit stack of nodes still to expand and field lines still to
+        # emit, so deep trees don't recurse
+        stack = [(node, indent)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                lines.append(item)
+                continue
+            node, indent = item
+            prefix = "  " * indent
+            lines.append(f"{prefix}{node.__class__.__name__}")
+            
+            # Print node attributes (nodes are slotted dataclasses, no __dict__)
+            if not is_dataclass(node):
+                continue
+            pending = []  # Field lines and child nodes, in output order
+            for field in fields(node):
+                if not field.init:
+                    continue  # Annotations added by later phases
+                key, value = field.name, getattr(node, field.name)
                 if isinstance(value, list):
                     if value and isinstance(value[0], (ASTNode, type(node))):
-                        print(f"{prefix}  {key}:")
-                        for item in value:
-                            self.print_ast(item, indent + 2)
+                        pending.append(f"{prefix}  {key}:")
+                        pending.extend((item, indent + 2) for item in value)
                     else:
-                        print(f"{prefix}  {key}: {value}")
+                        pending.append(f"{prefix}  {key}: {value}")
                 elif hasattr(value, '__class__') and hasattr(value.__class__, '__name__'):
                     if 'Node' in value.__class__.__name__:
-                        print(f"{prefix}  {key}:")
-                        self.print_ast(value, indent + 2)
+                        pending.append(f"{prefix}  {key}:")
+                        pending.append((value, indent + 2))
                     else:
-                        print(f"{prefix}  {key}: {value}")
+                        pending.append(f"{prefix}  {key}: {value}")
                 else:
-                    print(f"{prefix}  {key}: {value}")
+                    pending.append(f"{prefix}  {key}: {value}")
+            stack.extend(reversed(pending))
+        self.print_lines(lines)
+
+
+def compile_and_run(file: str, options: dict = None):
+    """Read a source file, then compile and run it; exits with status 1 on failure"""
+    # Read source file
+    try:
+        source_path = Path(file)
+        if not source_path.exists():
+            print(f"Error: File '{file}' not found", file=sys.stderr)
+            sys.exit(1)
+        
+        source_code = source_path.read_text(encoding='utf-8')
+    except Exception as e:
+        print(f"Error reading file: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    # Compile and run
+    compiler = CalcScriptCompiler(source_code, options)
+    compiler.compile_and_run()
 
 
 def main():
@@ -197,22 +235,10 @@ Examples:
     parser.add_argument('--show-optimized', action='store_true', help='Display optimized TAC')
     parser.add_argument('--no-execute', action='store_true', help='Compile only, do not execute')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output (show all phases)')
+    parser.add_argument('--fast-math', action='store_true', help='Use the math library instead of manual series for builtins')
     
     args = parser.parse_args()
     
-    # Read source file
-    try:
-        source_path = Path(args.file)
-        if not source_path.exists():
-            print(f"Error: File '{args.file}' not found", file=sys.stderr)
-            sys.exit(1)
-        
-        source_code = source_path.read_text(encoding='utf-8')
-    except Exception as e:
-        print(f"Error reading file: {e}", file=sys.stderr)
-        sys.exit(1)
-    
-    # Compile and run
     options = {
         'show_tokens': args.show_tokens,
         'show_ast': args.show_ast,
@@ -220,10 +246,10 @@ Examples:
         'show_optimized': args.show_optimized,
         'no_execute': args.no_execute,
         'verbose': args.verbose,
+        'fast_math': args.fast_math,
     }
     
-    compiler = CalcScriptCompiler(source_code, options)
-    compiler.compile_and_run()
+    compile_and_run(args.file, options)
 
 
 if __name__ == '__main__':
@@ -4,45 +4,136 @@ Test runner for CalcScript+ compiler
 Runs all test programs and displays results
 """
 
-import subprocess
+import io
+import multiprocessing
+import os
 import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from multiprocessing.connection import wait
 from pathlib import Path
 
+# Import the compiler once; test processes inherit or re-import it rather
+# than starting a fresh interpreter per test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'gui'))
+from main import compile_and_run
+
+TEST_TIMEOUT = 10  # Seconds, counted from when the test's process starts
+
+# Forked test processes start with the compiler already imported
+_CONTEXT = multiprocessing.get_context(
+    'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+)
+
+
+class _Discard:
+    """Write-only text sink that drops everything written to it"""
+    
+    def write(self, text):
+        return len(text)
+    
+    def flush(self):
+        pass
+
 
 def run_test(test_file: Path, show_output: bool = True):
     """Run a single test file"""
-    print("=" * 70)
-    print(f"Running: {test_file.name}")
-    print("=" * 70)
+    passed, report = collect_test(test_file, show_output)
+    print(report, end="")
+    return passed
+
+
+def collect_test(test_file: Path, show_output: bool = True):
+    """Run a single test file, returning (passed, report text) instead of printing"""
+    lines = [
+        "=" * 70,
+        f"Running: {test_file.name}",
+        "=" * 70
+    ]
     
+    # Program output is only kept when the report shows it; stderr is
+    # always kept for the failure report
+    stdout = io.StringIO() if show_output else _Discard()
+    stderr = io.StringIO()
     try:
-        # Get path to main.py
-        main_py = Path(__file__).parent.parent.parent / '3_Implementation' / 'main.py'
-        result = subprocess.run(
-            [sys.executable, str(main_py), str(test_file)],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            compile_and_run(str(test_file))
+        passed = True
+    except SystemExit as e:
+        passed = not e.code
+    except Exception as e:
+        print(f"Error running test: {e}", file=stderr)
+        passed = False
+    
+    if passed:
+        lines.append("[PASS] Test passed")
+        if show_output:
+            lines.append("\nOutput:")
+            lines.append(stdout.getvalue())
+    else:
+        lines.append("[FAIL] Test failed")
+        lines.append("\nError:")
+        lines.append(stderr.getvalue())
+    
+    return passed, "\n".join(lines) + "\n"
+
+
+def _send_report(conn, test_file: Path):
+    """Test process body: run the test and send (passed, report) back"""
+    conn.send(collect_test(test_file))
+    conn.close()
+
+
+def _failure_report(test_file: Path, reason: str):
+    """Report for a test whose process gave no result"""
+    return "\n".join([
+        "=" * 70,
+        f"Running: {test_file.name}",
+        "=" * 70,
+        f"[FAIL] {reason}",
+    ]) + "\n"
+
+
+def run_isolated(test_files, workers: int = None):
+    """Run each test in its own process, at most workers at a time
+    
+    A process still running TEST_TIMEOUT seconds after it started is
+    terminated. Returns (passed, report) per test, in test_files order.
+    """
+    workers = workers or os.cpu_count() or 1
+    outcomes = [None] * len(test_files)
+    queued = list(enumerate(test_files))[::-1]  # Popped from the end, in file order
+    running = {}  # Result pipe -> (index, process, deadline)
+    
+    while queued or running:
+        while queued and len(running) < workers:
+            index, test_file = queued.pop()
+            receiver, sender = _CONTEXT.Pipe(duplex=False)
+            process = _CONTEXT.Process(target=_send_report, args=(sender, test_file))
+            process.start()
+            sender.close()  # Only the child writes; EOF then means it died
+            running[receiver] = (index, process, time.monotonic() + TEST_TIMEOUT)
         
-        if result.returncode == 0:
-            print("[PASS] Test passed")
-            if show_output:
-                print("\nOutput:")
-                print(result.stdout)
-        else:
-            print("[FAIL] Test failed")
-            print("\nError:")
-            print(result.stderr)
+        next_deadline = min(deadline for _, _, deadline in running.values())
+        for receiver in wait(list(running), max(0, next_deadline - time.monotonic())):
+            index, process, _ = running.pop(receiver)
+            try:
+                outcomes[index] = receiver.recv()
+            except EOFError:
+                outcomes[index] = (False, _failure_report(test_files[index], "Test process crashed"))
+            receiver.close()
+            process.join()
         
-        return result.returncode == 0
+        now = time.monotonic()
+        for receiver, (index, process, deadline) in list(running.items()):
+            if deadline <= now:
+                del running[receiver]
+                process.terminate()
+                process.join()
+                receiver.close()
+                outcomes[index] = (False, _failure_report(test_files[index], "Test timed out"))
     
-    except subprocess.TimeoutExpired:
-        print("[FAIL] Test timed out")
-        return False
-    except Exception as e:
-        print(f"[FAIL] Error running test: {e}")
-        return False
+    return outcomes
 
 
 def main():
@@ -51,12 +142,8 @@ def main():
     script_dir = Path(__file__).parent
     tests_dir = script_dir / 'tests'
     
-    if not tests_dir.exists():
-        print(f"Error: tests directory not found at {tests_dir}")
-        sys.exit(1)
-    
-    # Find all .calc files
-    test_files = sorted(tests_dir.glob('*.calc'))
+    # Find all .calc files, here and in tests/ if present
+    test_files = sorted(script_dir.glob('*.calc')) + sorted(tests_dir.glob('*.calc'))
     
     if not test_files:
         print("No test files found")
@@ -67,11 +154,13 @@ def main():
     print("=" * 70)
     print(f"\nFound {len(test_files)} test(s)\n")
     
+    # Each test runs in its own process, so one that hangs or exits can't
+    # take the runner down or hold up the others; reports are printed
+    # whole and in file order
     results = []
-    for test_file in test_files:
-        passed = run_test(test_file)
+    for test_file, (passed, report) in zip(test_files, run_isolated(test_files)):
+        print(report)
         results.append((test_file.name, passed))
-        print()
     
     # Summary
     print("=" * 70)
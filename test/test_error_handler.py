@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Suggestion tests for the lexical error handler
+Every matching backend must agree with difflib.get_close_matches
+"""
+
+import sys
+import unittest
+from difflib import get_close_matches
+from pathlib import Path
+from unittest import mock
+
+# Add compiler phases to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'Compiler' / 'Phase1_Lexical_Analysis'))
+
+import error_handler
+
+IDENTIFIERS = (
+    'counter', 'count', 'total', 'result', 'results', 'index', 'value', 'values',
+    'matrix_a', 'matrix_b', 'matrix_sum', 'average', 'maximum', 'minimum',
+    'temp', 'temperature', 'sum_squares', 'factorial', 'fibonacci', 'is_prime'
+)
+
+MISSPELLINGS = (
+    'countr', 'conter', 'totl', 'reslt', 'resuts', 'indx', 'vlaue', 'valeus',
+    'matrx_a', 'matirx_b', 'averge', 'maximun', 'minumum', 'tmp', 'temprature',
+    'sum_square', 'factoral', 'fibonaci', 'is_prme', 'whle', 'pirnt', 'retrun',
+    'fucntion', 'flaot', 'strng', 'booleen', 'xyzzy'
+)
+
+
+class SuggestionBackendTest(unittest.TestCase):
+    """find_suggestions against difflib, one test per backend"""
+    
+    def assert_matches_difflib(self):
+        handler = error_handler.ErrorHandler()
+        for name in IDENTIFIERS:
+            handler.add_identifier(name)
+        pool = set(IDENTIFIERS) | error_handler.KNOWN_KEYWORDS
+        for wrong_name in MISSPELLINGS:
+            with self.subTest(wrong_name=wrong_name):
+                self.assertEqual(handler.find_suggestions(wrong_name),
+                                 get_close_matches(wrong_name, pool, n=3, cutoff=0.6))
+    
+    def test_trie_fallback(self):
+        with mock.patch.object(error_handler, 'fuzz_process', None), \
+                mock.patch.object(error_handler, '_lev_kernel', False):
+            self.assert_matches_difflib()
+    
+    def test_numba_kernel(self):
+        if error_handler._edit_distance_kernel() is None:
+            self.skipTest("NumPy or Numba is not installed")
+        with mock.patch.object(error_handler, 'fuzz_process', None):
+            self.assert_matches_difflib()
+    
+    def test_rapidfuzz(self):
+        if error_handler.fuzz_process is None:
+            self.skipTest("RapidFuzz is not installed")
+        self.assert_matches_difflib()
+    
+    def test_rapidfuzz_batch(self):
+        if error_handler.fuzz_process is None:
+            self.skipTest("RapidFuzz is not installed")
+        handler = error_handler.ErrorHandler()
+        for name in IDENTIFIERS:
+            handler.add_identifier(name)
+        for line, wrong_name in enumerate(MISSPELLINGS, 1):
+            handler.add_error(f"Undefined variable '{wrong_name}'", line, wrong_name=wrong_name)
+        
+        pool = set(IDENTIFIERS) | error_handler.KNOWN_KEYWORDS
+        for error in handler.errors:
+            with self.subTest(wrong_name=error.wrong_name):
+                self.assertEqual(error.suggestions or [],
+                                 get_close_matches(error.wrong_name, pool, n=3, cutoff=0.6))
+
+
+if __name__ == '__main__':
+    unittest.main()
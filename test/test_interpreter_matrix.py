@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Matrix determinant tests for the CalcScript+ interpreter
+matrix_det is not callable from CalcScript source, so it is checked here
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add compiler phases to path
+project_root = Path(__file__).parent.parent
+for phase_dir in ('Phase2_Syntax_Analysis', 'Phase4_Intermediate_Code', 'Phase6_Code_Generation'):
+    sys.path.insert(0, str(project_root / 'Compiler' / phase_dir))
+
+from interpreter import Interpreter
+
+
+class MatrixDeterminantTest(unittest.TestCase):
+    """Determinants on the elimination paths used from 4x4 up"""
+    
+    def setUp(self):
+        self.interpreter = Interpreter()
+    
+    def test_integer_determinant_is_exact(self):
+        m = [[2, 1, 3, 4, 5], [1, 3, 2, 0, 1], [4, 1, 0, 2, 3], [0, 2, 1, 5, 1], [3, 0, 2, 1, 4]]
+        det = self.interpreter._matrix_determinant(m)
+        self.assertIsInstance(det, int)
+        self.assertEqual(det, 111)
+    
+    def test_float_determinant(self):
+        m = [[2.0, 0.0, 0.0, 0.0], [0.0, 3.0, 0.0, 0.0], [0.0, 0.0, 4.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+        self.assertEqual(self.interpreter._matrix_determinant(m), 24.0)
+    
+    def test_row_swap_flips_sign(self):
+        m = [[0, 1, 0, 0], [1, 0, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+        self.assertEqual(self.interpreter._matrix_determinant(m), -1)
+        floats = [[float(x) for x in row] for row in m]
+        self.assertEqual(self.interpreter._matrix_determinant(floats), -1.0)
+    
+    def test_singular_float_determinant_is_zero(self):
+        m = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 16.0]]
+        self.assertEqual(self.interpreter._matrix_determinant(m), 0.0)
+    
+    def test_singular_inverse_is_empty(self):
+        self.assertEqual(self.interpreter._matrix_inverse([[1, 2, 3], [4, 5, 6], [7, 8, 9]]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()